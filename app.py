@@ -2,6 +2,7 @@ from flask import Flask
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from models import db
+from migrations import upgrade
 
 app = Flask(__name__)
 
@@ -12,7 +13,7 @@ CORS(app, resources={
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         "allow_headers": ["Content-Type", "Authorization"],
         "supports_credentials": True,
-        "expose_headers": ["Content-Type", "Authorization"]
+        "expose_headers": ["Content-Type", "Authorization", "X-Next-Cursor", "Link", "ETag", "Last-Modified", "X-Total-Count"]
     }
 })
 
@@ -29,9 +30,10 @@ jwt = JWTManager(app)
 from routes.medical import medical
 app.register_blueprint(medical, url_prefix='/api/medical')
 
-# Create database tables
+# Create database tables, then bring existing databases up to the current schema
 with app.app_context():
     db.create_all()
+    upgrade(db.engine)
 
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
\ No newline at end of file
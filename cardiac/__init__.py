@@ -0,0 +1,55 @@
+"""
+Headless cardiac phase model: preprocessing, prediction, reports, trends and
+model registry. Importing the package pulls in NumPy only; pandas,
+scikit-learn, joblib and matplotlib are loaded when the code that needs them
+runs. Training (batch and online), cohort generation, monitoring and
+plotting live in submodules that are imported on first attribute access.
+"""
+
+from importlib import import_module
+
+from .downsampling import downsample_series, lttb
+from .features import VitalsFeatureBuilder, build_features
+from .compiled import CompiledForest, CompiledLinearModel, benchmark_compiled_inference, compile_cardiac_model
+from .instrumentation import PredictionMonitor
+from .predictor import predict_patient_phase, predict_patient_phases, set_prediction_monitor
+from .preprocessing import CardiacDataPreprocessor
+from .registry import CardiacModelRegistry, load_or_train_cardiac_model
+from .reports import build_report_record, create_patient_report, iter_patient_reports, write_handover_report
+from .schema import (
+    DATASET_COLUMNS, FEATURE_NAMES, INVERSE_PHASE_MAP, PHASE_LABELS, PHASE_MAP,
+    PHASE_RISK_LEVELS, RISK_LABELS, TREND_VITALS
+)
+from .trends import VitalsTrendBuffer
+
+# Names served from heavier submodules, imported only when first used
+_LAZY_ATTRIBUTES = {
+    'generate_cardiac_dataset': 'dataset',
+    'iter_cardiac_cohort': 'dataset',
+    'write_cardiac_cohort': 'dataset',
+    'CohortStore': 'storage',
+    'convert_csv_to_cohort_store': 'storage',
+    'MODEL_CANDIDATES': 'training',
+    'select_cardiac_model': 'training',
+    'train_cardiac_models': 'training',
+    'train_cardiac_model_out_of_core': 'training',
+    'OnlineCardiacLearner': 'online',
+    'resume_online_learner': 'online',
+    'MonitoredPatient': 'monitoring',
+    'WardMonitor': 'monitoring',
+    'simulate_vitals': 'monitoring',
+    'simulate_ward_readings': 'monitoring',
+    'simulate_ward_vitals': 'monitoring',
+    'WardReplay': 'replay',
+    'recorded_ward_stream': 'replay',
+    'synthetic_ward_stream': 'replay',
+    'plot_trends': 'visualization',
+    'TrendRenderer': 'rendering'
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
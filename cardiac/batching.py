@@ -0,0 +1,120 @@
+"""Micro-batching of concurrent prediction requests"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from .instrumentation import batch_size_bucket
+
+_STOP = object()
+
+class MicroBatcher:
+    """
+    Collects items submitted from many threads into batches of at most
+    `max_batch_size`, waiting at most `max_wait_ms` after the first item of a
+    batch, and hands each batch to `predict_batch(items) -> results` on one
+    worker thread. Every submit returns a Future for that item's result; when
+    a batch call raises, its items are retried one at a time so the error
+    reaches only the callers whose items fail on their own.
+    """
+    def __init__(self, predict_batch, max_batch_size=64, max_wait_ms=5.0):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {
+            'batches': 0,
+            'items': 0,
+            'errors': 0,
+            'max_batch_size': 0,
+            'last_batch_size': 0,
+            'last_batch_ms': 0.0,
+            'batch_size_histogram': {}
+        }
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, item):
+        if self._thread is None:
+            self.start()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            items = [item for item, _ in batch]
+            started = time.perf_counter()
+            try:
+                results = self.predict_batch(items)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+                failed = False
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                else:
+                    # Re-score one by one so a single bad row only fails its own caller
+                    for item, future in batch:
+                        try:
+                            future.set_result(self.predict_batch([item])[0])
+                        except Exception as item_error:
+                            future.set_exception(item_error)
+                failed = True
+            self._record(len(batch), time.perf_counter() - started, failed)
+
+    def _record(self, size, seconds, failed):
+        bucket = batch_size_bucket(size)
+        with self._lock:
+            stats = self._stats
+            stats['batches'] += 1
+            stats['items'] += size
+            stats['errors'] += int(failed)
+            stats['max_batch_size'] = max(stats['max_batch_size'], size)
+            stats['last_batch_size'] = size
+            stats['last_batch_ms'] = seconds * 1000
+            stats['batch_size_histogram'][bucket] = stats['batch_size_histogram'].get(bucket, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats, batch_size_histogram=dict(self._stats['batch_size_histogram']))
+        snapshot['queue_depth'] = self._queue.qsize()
+        snapshot['mean_batch_size'] = snapshot['items'] / snapshot['batches'] if snapshot['batches'] else 0.0
+        snapshot['max_batch_size_limit'] = self.max_batch_size
+        snapshot['max_wait_ms'] = self.max_wait_s * 1000
+        return snapshot
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
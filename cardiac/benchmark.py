@@ -0,0 +1,238 @@
+"""
+Reproducible benchmarks of the cardiac prediction pipeline.
+
+Runs cohort generation, preprocessing, training, prediction and report
+generation at several cohort and batch sizes, with warmup and repeated
+timings, and records wall time, peak traced memory and throughput to a JSON
+file. With a baseline file, stages slower (or hungrier) than the baseline by
+more than the tolerance are reported and the run exits non-zero.
+
+    python -m cardiac.benchmark --quick
+    python -m cardiac.benchmark --output bench.json --baseline cardiac_benchmark_baseline.json
+    python -m cardiac.benchmark --save-baseline cardiac_benchmark_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from . import (
+    CardiacDataPreprocessor, compile_cardiac_model, create_patient_report,
+    predict_patient_phase, predict_patient_phases, write_handover_report
+)
+
+DEFAULT_COHORT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_TRAIN_SIZES = [1_000, 5_000]
+DEFAULT_BATCH_SIZES = [1, 100, 1_000, 10_000]
+DEFAULT_TOLERANCE = 0.25
+# Timing differences below this are scheduler noise, not regressions
+MIN_REGRESSION_DELTA_S = 0.0005
+
+def _quiet(func, *args, **kwargs):
+    # Pipeline stages print progress lines that would drown the results
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+def measure(stage, func, rows, repeats=5, warmup=1, size=None, batch_size=None):
+    """
+    Time `func()` `repeats` times after `warmup` untimed runs, then run it once
+    more under tracemalloc for peak memory. `rows` is the work per call used
+    for throughput.
+    """
+    for _ in range(warmup):
+        _quiet(func)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        _quiet(func)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        _quiet(func)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        'stage': stage,
+        'size': size,
+        'batch_size': batch_size,
+        'repeats': repeats,
+        'wall_s_median': median,
+        'wall_s_min': min(timings),
+        'peak_mb': peak / 2**20,
+        'throughput_per_s': rows / median if median > 0 else float('inf')
+    }
+
+def _fresh_path(directory):
+    # generate_cardiac_dataset reuses an existing file, so every run gets a new one
+    return os.path.join(directory, f"cohort_{time.perf_counter_ns()}.csv")
+
+def run_benchmarks(cohort_sizes=None, train_sizes=None, batch_sizes=None, repeats=5, warmup=1):
+    from .dataset import generate_cardiac_dataset, iter_cardiac_cohort
+    from .training import train_cardiac_models
+
+    cohort_sizes = cohort_sizes or DEFAULT_COHORT_SIZES
+    train_sizes = train_sizes or DEFAULT_TRAIN_SIZES
+    batch_sizes = batch_sizes or DEFAULT_BATCH_SIZES
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in cohort_sizes:
+            print(f"⏱️  generate_cardiac_dataset n={size}")
+            results.append(measure(
+                'generate_cardiac_dataset',
+                lambda: generate_cardiac_dataset(size, _fresh_path(directory)),
+                size, repeats, warmup, size=size))
+
+    for size in cohort_sizes:
+        df = next(iter_cardiac_cohort(size, chunk_size=size))
+        print(f"⏱️  preprocess n={size}")
+        results.append(measure(
+            'preprocess', lambda: CardiacDataPreprocessor().preprocess(df),
+            size, repeats, warmup, size=size))
+        print(f"⏱️  preprocess_compact n={size}")
+        results.append(measure(
+            'preprocess_compact', lambda: CardiacDataPreprocessor().preprocess_compact(df),
+            size, repeats, warmup, size=size))
+
+    for size in train_sizes:
+        df = next(iter_cardiac_cohort(size, chunk_size=size))
+        X, y = _quiet(CardiacDataPreprocessor().preprocess, df)
+        print(f"⏱️  train_cardiac_models n={size}")
+        # Training is the slowest stage; one warmup-free run per repeat is plenty
+        results.append(measure(
+            'train_cardiac_models', lambda: train_cardiac_models(X, y, cv=3),
+            size, max(1, repeats // 2), 0, size=size))
+
+    # Prediction and reports use a fixed model so only the batch size varies
+    largest_batch = max(batch_sizes)
+    df = next(iter_cardiac_cohort(max(largest_batch, 2_000), chunk_size=max(largest_batch, 2_000)))
+    preprocessor = CardiacDataPreprocessor()
+    X, y = _quiet(preprocessor.preprocess, df)
+    model, _ = _quiet(train_cardiac_models, X.to_numpy()[:2_000], y.to_numpy()[:2_000], cv=3)
+    compiled = compile_cardiac_model(model, preprocessor.scaler)
+    features = df[preprocessor.feature_names].to_numpy()
+    records = df[preprocessor.feature_names].to_dict('records')
+    scaler, names = preprocessor.scaler, preprocessor.feature_names
+
+    print("⏱️  predict_patient_phase (single patient)")
+    results.append(measure(
+        'predict_patient_phase', lambda: predict_patient_phase(records[0], model, scaler, names),
+        1, repeats * 20, warmup, batch_size=1))
+    for batch_size in batch_sizes:
+        print(f"⏱️  predict_patient_phases batch={batch_size}")
+        batch = records[:batch_size]
+        results.append(measure(
+            'predict_patient_phases', lambda: predict_patient_phases(batch, model, scaler, names),
+            batch_size, repeats, warmup, batch_size=batch_size))
+        matrix = features[:batch_size]
+        results.append(measure(
+            'predict_patient_phases_compiled', lambda: predict_patient_phases(matrix, compiled, None, names),
+            batch_size, repeats, warmup, batch_size=batch_size))
+
+    phases, risks = predict_patient_phases(features, model, scaler, names)
+    print("⏱️  create_patient_report (single patient)")
+    results.append(measure(
+        'create_patient_report', lambda: create_patient_report(records[0], str(phases[0]), str(risks[0])),
+        1, repeats * 20, warmup, batch_size=1))
+    for batch_size in batch_sizes:
+        print(f"⏱️  write_handover_report batch={batch_size}")
+        entries = list(zip(range(batch_size), records, phases.tolist(), risks.tolist()))
+        results.append(measure(
+            'write_handover_report', lambda: write_handover_report(entries, io.StringIO()),
+            batch_size, repeats, warmup, batch_size=batch_size))
+    return results
+
+def _environment():
+    import sklearn
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+def _key(result):
+    return (result['stage'], result['size'], result['batch_size'])
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return a list of human-readable regressions against a baseline results file"""
+    reference = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        base = reference.get(_key(result))
+        if base is None:
+            continue
+        label = f"{result['stage']} size={result['size']} batch={result['batch_size']}"
+        slower_by = result['wall_s_median'] - base['wall_s_median']
+        if slower_by > base['wall_s_median'] * tolerance and slower_by > MIN_REGRESSION_DELTA_S:
+            regressions.append(f"{label}: {result['wall_s_median'] * 1000:.2f} ms vs baseline "
+                               f"{base['wall_s_median'] * 1000:.2f} ms")
+        if result['peak_mb'] > base['peak_mb'] * (1 + tolerance) + 1:
+            regressions.append(f"{label}: peak {result['peak_mb']:.1f} MB vs baseline {base['peak_mb']:.1f} MB")
+    return regressions
+
+def _print_table(results):
+    print(f"\n{'stage':34} {'size':>8} {'batch':>7} {'median ms':>11} {'peak MB':>9} {'rows/s':>12}")
+    for r in results:
+        print(f"{r['stage']:34} {r['size'] or '':>8} {r['batch_size'] or '':>7} "
+              f"{r['wall_s_median'] * 1000:>11.2f} {r['peak_mb']:>9.1f} {r['throughput_per_s']:>12.0f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', help='cohort sizes for generation and preprocessing')
+    parser.add_argument('--train-sizes', type=int, nargs='+', help='cohort sizes for training')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', help='batch sizes for prediction and reports')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--quick', action='store_true', help='small sizes for a fast smoke run')
+    parser.add_argument('--output', default='cardiac_benchmark_results.json')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--save-baseline', help='also write the results to this baseline file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed slowdown/memory growth as a fraction (default 0.25)')
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.sizes = args.sizes or [1_000, 10_000]
+        args.train_sizes = args.train_sizes or [1_000]
+        args.batch_sizes = args.batch_sizes or [1, 100, 1_000]
+        args.repeats = min(args.repeats, 3)
+
+    results = run_benchmarks(args.sizes, args.train_sizes, args.batch_sizes, args.repeats, args.warmup)
+    payload = {'environment': _environment(), 'results': results}
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+    _print_table(results)
+    print(f"\n💾 Results written to '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against '{args.baseline}':")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"\n✅ No regressions against '{args.baseline}' (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Pure-NumPy evaluators exported from the fitted sklearn classifiers"""
+
+import time
+
+import numpy as np
+
+class CompiledForest:
+    """
+    A fitted RandomForestClassifier flattened into node arrays (feature,
+    threshold, children, leaf class distribution) for every tree, evaluated
+    with vectorized NumPy traversal. Raw (unscaled) features go in: the fitted
+    scaler's statistics are part of the compiled model.
+    """
+    def __init__(self, forest, scaler=None):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = offsets[:-1]
+        self.max_depth = max(tree.max_depth for tree in trees)
+        self.classes_ = np.asarray(forest.classes_)
+
+        features, thresholds, lefts, rights, missing_left, values = [], [], [], [], [], []
+        for tree, offset in zip(trees, self.roots):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            # Leaves point to themselves so extra traversal steps are no-ops
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            missing = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+            missing_left.append(np.asarray(missing, dtype=bool) & ~is_leaf)
+            value = tree.value[:, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.missing_go_to_left = np.concatenate(missing_left)
+        self.leaf_value = np.concatenate(values)
+
+        self.mean = None if scaler is None else np.asarray(scaler.mean_, dtype=float)
+        self.scale = None if scaler is None else np.asarray(scaler.scale_, dtype=float)
+
+    def _prepare(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.mean is not None:
+            X = (X - self.mean) / self.scale
+        # sklearn trees compare float32 features against float64 thresholds
+        return X.astype(np.float32).astype(float)
+
+    def apply(self, X):
+        """Leaf index reached in every tree, shape (n_rows, n_trees)"""
+        X = self._prepare(X)
+        n_rows, n_trees = len(X), len(self.roots)
+        node = np.tile(self.roots, n_rows)
+        # Flat offset of each (row, tree) pair's feature vector in X
+        row_offset = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        flat_X = X.ravel()
+        active = np.arange(node.size)
+        for _ in range(self.max_depth):
+            current = node[active]
+            x = flat_X[row_offset[active] + self.feature[current]]
+            go_left = (x <= self.threshold[current]) | (np.isnan(x) & self.missing_go_to_left[current])
+            child = np.where(go_left, self.left[current], self.right[current])
+            node[active] = child
+            # Only keep walking the (row, tree) pairs that have not reached a leaf
+            active = active[self.left[child] != child]
+            if active.size == 0:
+                break
+        return node.reshape(n_rows, n_trees)
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        # Accumulate tree by tree, like sklearn, so averaged probabilities match bit for bit
+        proba = np.zeros((len(leaves), self.leaf_value.shape[1]))
+        for t in range(leaves.shape[1]):
+            proba += self.leaf_value[leaves[:, t]]
+        return proba / leaves.shape[1]
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+class CompiledLinearModel:
+    """
+    A fitted linear classifier (LogisticRegression, or the online learner's
+    SGDClassifier) reduced to one weight matrix and bias vector, with the
+    scaler folded in: w' = w / scale and b' = b - w' . mean.
+    """
+    def __init__(self, model, scaler=None):
+        coef = np.asarray(model.coef_, dtype=float)
+        intercept = np.asarray(model.intercept_, dtype=float)
+        if scaler is not None:
+            coef = coef / scaler.scale_
+            intercept = intercept - coef @ scaler.mean_
+        self.weights = np.ascontiguousarray(coef.T)
+        self.bias = intercept
+        self.classes_ = np.asarray(model.classes_)
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X @ self.weights + self.bias
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[np.argmax(scores, axis=1)]
+
+def compile_cardiac_model(model, scaler=None):
+    """
+    Export a fitted RandomForest or linear model to a pure-NumPy model
+    that scores raw feature rows. Use it with predict_patient_phases(...,
+    scaler=None, ...) since scaling is already part of the compiled model.
+    A compiled forest is meant for single patients and small batches; for
+    thousands of rows sklearn's own tree code is faster.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+    if isinstance(model, RandomForestClassifier):
+        return CompiledForest(model, scaler)
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        return CompiledLinearModel(model, scaler)
+    raise TypeError(f"Cannot compile a {type(model).__name__}")
+
+def benchmark_compiled_inference(model, scaler, X_raw, repeats=200):
+    """
+    Check that the compiled model agrees with sklearn on `X_raw` and print the
+    single-row and whole-batch latency of both paths.
+    """
+    X_raw = np.asarray(X_raw, dtype=float)
+    compiled = compile_cardiac_model(model, scaler)
+    expected = model.predict(scaler.transform(X_raw))
+    actual = compiled.predict(X_raw)
+    mismatches = int(np.sum(expected != actual))
+
+    def best_of(func, rows, n):
+        return min(_timed(func, rows) for _ in range(n))
+
+    single_row = X_raw[:1]
+    results = {
+        'rows': len(X_raw),
+        'mismatches': mismatches,
+        'sklearn_single_ms': best_of(lambda rows: model.predict(scaler.transform(rows)), single_row, repeats) * 1000,
+        'compiled_single_ms': best_of(compiled.predict, single_row, repeats) * 1000,
+        'sklearn_batch_ms': best_of(lambda rows: model.predict(scaler.transform(rows)), X_raw, 5) * 1000,
+        'compiled_batch_ms': best_of(compiled.predict, X_raw, 5) * 1000
+    }
+    results['single_speedup'] = results['sklearn_single_ms'] / results['compiled_single_ms']
+    results['batch_speedup'] = results['sklearn_batch_ms'] / results['compiled_batch_ms']
+
+    print(f"⚡ {type(model).__name__}: {mismatches} mismatches over {len(X_raw)} rows")
+    print(f"   single row: sklearn {results['sklearn_single_ms']:.3f} ms vs compiled "
+          f"{results['compiled_single_ms']:.3f} ms ({results['single_speedup']:.0f}x)")
+    print(f"   batch:      sklearn {results['sklearn_batch_ms']:.1f} ms vs compiled "
+          f"{results['compiled_batch_ms']:.1f} ms ({results['batch_speedup']:.1f}x)")
+    return results
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
@@ -0,0 +1,90 @@
+"""Synthetic cardiac cohort generation"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .schema import (
+    CLINICAL_LIMITS, DATASET_COLUMNS, PHASE_DISTRIBUTIONS, PHASE_LABELS,
+    PHASE_SAMPLED_COLUMNS, SAMPLED_LOWER_LIMITS, SAMPLED_UPPER_LIMITS
+)
+from .storage import COHORT_STORE_SUFFIX, CohortStore, read_csv_columns
+
+def _sample_cohort_chunk(rng, first_patient_id, n_rows):
+    """Sample one block of synthetic patients with array operations only"""
+    # 70% normal, 30% cardiac arrest risk; risk cases split 60/40 between
+    # the compensatory and decompensatory phases
+    is_cardiac_event = rng.random(n_rows) < 0.3
+    is_decompensatory = rng.random(n_rows) >= 0.6
+    phase_codes = np.where(is_cardiac_event, np.where(is_decompensatory, 2, 1), 0)
+
+    sampled = np.empty((n_rows, len(PHASE_SAMPLED_COLUMNS)))
+    for code, phase in enumerate(PHASE_LABELS):
+        rows = np.flatnonzero(phase_codes == code)
+        if rows.size == 0:
+            continue
+        mean, std = np.asarray(PHASE_DISTRIBUTIONS[phase]).T
+        sampled[rows] = rng.normal(mean, std, size=(rows.size, mean.size))
+    np.clip(sampled, SAMPLED_LOWER_LIMITS, SAMPLED_UPPER_LIMITS, out=sampled)
+
+    chunk = pd.DataFrame(sampled, columns=PHASE_SAMPLED_COLUMNS)
+    chunk.insert(0, 'patient_id', np.arange(first_patient_id, first_patient_id + n_rows))
+    chunk['age'] = np.clip(rng.normal(65, 15, size=n_rows), *CLINICAL_LIMITS['age'])
+    chunk['gender'] = rng.integers(0, 2, size=n_rows)
+    chunk['physiological_phase'] = PHASE_LABELS[phase_codes]
+    return chunk[DATASET_COLUMNS]
+
+def iter_cardiac_cohort(n_patients, chunk_size=100_000, seed=42):
+    """
+    Yield the synthetic cohort as DataFrames of at most `chunk_size` rows.
+    The same seed and chunk_size always reproduce the same cohort.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_patients, chunk_size):
+        yield _sample_cohort_chunk(rng, start, min(chunk_size, n_patients - start))
+
+def write_cardiac_cohort(n_patients, filepath, chunk_size=100_000, seed=42):
+    """
+    Stream a synthetic cohort to CSV chunk by chunk, so memory stays bounded by
+    `chunk_size` no matter how many rows are generated. A `filepath` ending in
+    '.cohort' writes a memory-mappable columnar store instead.
+    """
+    if filepath.endswith(COHORT_STORE_SUFFIX):
+        store = CohortStore.write(filepath, iter_cardiac_cohort(n_patients, chunk_size=chunk_size, seed=seed))
+        print(f"✅ Cohort of {store.n_rows} patients streamed to '{filepath}'")
+        return store.n_rows
+    rows_written = 0
+    for chunk in iter_cardiac_cohort(n_patients, chunk_size=chunk_size, seed=seed):
+        chunk.to_csv(filepath, mode='w' if rows_written == 0 else 'a',
+                     header=rows_written == 0, index=False)
+        rows_written += len(chunk)
+    print(f"✅ Cohort of {rows_written} patients streamed to '{filepath}'")
+    return rows_written
+
+def generate_cardiac_dataset(n_patients=200, filepath='clinical_scale_cardiac_event_dataset_no_sensitive.csv'):
+    """
+    Generate synthetic patient data with explicit physiological phases and save it.
+    This function is now smart enough to check if an existing file is compatible.
+    """
+    if os.path.exists(filepath):
+        try:
+            # Check the header line before reading the whole file
+            if 'physiological_phase' in read_csv_columns(filepath):
+                print(f"✅ Found compatible dataset at '{filepath}'. Skipping generation.")
+                return pd.read_csv(filepath)
+            else:
+                print(f"⚠️ Found an old dataset file at '{filepath}'. It is not compatible with this version.")
+                print("🔄 Deleting old file and generating a new, compatible dataset...")
+                os.remove(filepath)
+        except Exception as e:
+            print(f"Error reading dataset file: {e}")
+            print("🔄 Generating a new dataset...")
+    
+    print(f"🔄 Generating synthetic dataset for {n_patients} patients...")
+    
+    df = pd.concat(iter_cardiac_cohort(n_patients), ignore_index=True)
+    df.to_csv(filepath, index=False)
+    
+    print(f"✅ Dataset created and saved as '{filepath}' with {len(df)} patients")
+    return df
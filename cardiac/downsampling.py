@@ -0,0 +1,42 @@
+"""Shape-preserving downsampling of long vital-sign series"""
+
+import numpy as np
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points of (x, y) that
+    keep the visual shape of the series. The first and last points are always
+    kept; every bucket in between contributes the point forming the largest
+    triangle with the previously kept point and the next bucket's average.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n - 2 interior points split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[anchor] - avg_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (avg_y - y[anchor]))
+        anchor = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected[i + 1] = anchor
+    return selected
+
+def downsample_series(x, y, n_out):
+    """Return (x, y) reduced to at most `n_out` points with LTTB"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= n_out:
+        return x, y
+    numeric_x = x.astype('datetime64[ms]').astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    keep = lttb(numeric_x, y, n_out)
+    return x[keep], y[keep]
@@ -0,0 +1,222 @@
+"""
+Vectorized construction of the 19 model features from raw, irregularly
+sampled vital-sign series of many patients.
+
+Samples are resampled onto a regular grid per patient (the last value in
+each interval, carried forward across gaps and per vital, so a monitor that
+reports SpO2 every minute and blood pressure every half hour still yields
+one complete row per interval). Trends are windowed differences on that
+grid and variability the standard deviation over the statistics window, as
+in VitalsTrendBuffer for regular 15-minute readings.
+"""
+
+import numpy as np
+
+from .schema import FEATURE_NAMES, TREND_VITALS
+
+_HR, _RR, _SBP, _DBP, _SPO2, _TEMP = range(len(TREND_VITALS))
+
+class VitalsFeatureBuilder:
+    """
+    Incremental feature builder for a whole ward. Each patient keeps only the
+    grid intervals the features look back over, so update() costs time
+    proportional to the new samples (and the grid intervals they advance),
+    not to the history already seen.
+    """
+    def __init__(self, interval_minutes=15, window=24, readings_per_hour=4, default_age=65, default_gender=1):
+        self.interval_ms = int(interval_minutes * 60_000)
+        self.window = window
+        self.lag_1h = readings_per_hour
+        self.lag_6h = 6 * readings_per_hour
+        # Grid intervals kept per patient: the 6-hour lag and the statistics window
+        self.depth = max(self.lag_6h, window) + 1
+        self.default_age = default_age
+        self.default_gender = default_gender
+        self._slots = {}
+        self._patient_ids = []
+        self._history = np.full((0, self.depth, len(TREND_VITALS)), np.nan)
+        self._last_bin = np.zeros(0, dtype=np.int64)
+        self._n_bins = np.zeros(0, dtype=np.int64)
+        self._static = np.zeros((0, 2))
+        self.late_samples_dropped = 0
+
+    def __len__(self):
+        return len(self._patient_ids)
+
+    def _slots_for(self, patient_ids):
+        unique, inverse = np.unique(np.asarray(patient_ids), return_inverse=True)
+        slots = np.empty(len(unique), dtype=np.int64)
+        for i, patient_id in enumerate(unique.tolist()):
+            slot = self._slots.get(patient_id)
+            if slot is None:
+                slot = self._slots[patient_id] = len(self._patient_ids)
+                self._patient_ids.append(patient_id)
+            slots[i] = slot
+        if len(self._patient_ids) > len(self._last_bin):
+            self._grow(len(self._patient_ids))
+        return slots[inverse]
+
+    def _grow(self, n_patients):
+        # Capacity doubles so admitting patients one by one stays amortized O(1)
+        capacity = max(n_patients, 2 * len(self._last_bin), 64)
+        extra = capacity - len(self._last_bin)
+        self._history = np.concatenate([self._history, np.full((extra, self.depth, len(TREND_VITALS)), np.nan)])
+        self._last_bin = np.concatenate([self._last_bin, np.full(extra, -1, dtype=np.int64)])
+        self._n_bins = np.concatenate([self._n_bins, np.zeros(extra, dtype=np.int64)])
+        self._static = np.concatenate(
+            [self._static, np.tile([self.default_age, self.default_gender], (extra, 1)).astype(float)])
+
+    def set_static(self, patient_ids, age=None, gender=None):
+        """Record age and gender of patients (defaults apply until set)"""
+        slots = self._slots_for(patient_ids)
+        if age is not None:
+            self._static[slots, 0] = age
+        if gender is not None:
+            self._static[slots, 1] = gender
+
+    def update(self, patient_ids, timestamps, values):
+        """
+        Add raw samples: parallel arrays of patient ids, timestamps
+        (datetime64 or epoch milliseconds) and an N x 6 array of TREND_VITALS,
+        NaN where a sample does not carry a vital. Samples from before a
+        patient's newest grid interval are dropped. Returns the ids of the
+        patients whose features changed.
+        """
+        values = np.asarray(values, dtype=float).reshape(-1, len(TREND_VITALS))
+        if len(values) == 0:
+            return np.asarray([])
+        slots = self._slots_for(patient_ids)
+        timestamps = np.asarray(timestamps)
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype('datetime64[ms]').astype(np.int64)
+        bins = timestamps.astype(np.int64) // self.interval_ms
+
+        late = bins < self._last_bin[slots]
+        if late.any():
+            self.late_samples_dropped += int(late.sum())
+            slots, bins, timestamps, values = slots[~late], bins[~late], timestamps[~late], values[~late]
+            if len(slots) == 0:
+                return np.asarray([])
+        order = np.lexsort((timestamps, bins, slots))
+        slots, bins, values = slots[order], bins[order], values[order]
+
+        # One (patient, interval) group per distinct bin; a patient's k-th new
+        # interval is applied in round k so every round is one vectorized step
+        group_start = np.ones(len(slots), dtype=bool)
+        group_start[1:] = (slots[1:] != slots[:-1]) | (bins[1:] != bins[:-1])
+        group_id = np.cumsum(group_start) - 1
+        group_slot, group_bin = slots[group_start], bins[group_start]
+        patient_start = np.ones(len(group_slot), dtype=bool)
+        patient_start[1:] = group_slot[1:] != group_slot[:-1]
+        first_group = np.maximum.accumulate(np.where(patient_start, np.arange(len(group_slot)), 0))
+        group_round = np.arange(len(group_slot)) - first_group
+
+        # Last observed value of every vital in each group
+        group_values = np.full((len(group_slot), len(TREND_VITALS)), np.nan)
+        for j in range(len(TREND_VITALS)):
+            observed = np.flatnonzero(~np.isnan(values[:, j]))
+            observed_group = group_id[observed]
+            # Rows are time-ordered within a group, so its last observation wins
+            is_last = np.ones(len(observed), dtype=bool)
+            is_last[:-1] = observed_group[1:] != observed_group[:-1]
+            group_values[observed_group[is_last], j] = values[observed[is_last], j]
+
+        for k in range(int(group_round.max()) + 1):
+            in_round = group_round == k
+            self._advance(group_slot[in_round], group_bin[in_round], group_values[in_round])
+        return np.asarray(self._patient_ids, dtype=object)[np.unique(group_slot)]
+
+    def _advance(self, slots, bins, values):
+        """Move each patient's grid to `bins` (at most one per patient), carrying values forward"""
+        last = self._last_bin[slots]
+        started = self._n_bins[slots] > 0
+        steps = np.where(started, bins - last, 1)
+        # Carry the last interval forward over the gap (at most `depth` intervals matter)
+        carried = np.minimum(steps, self.depth)
+        moving = started & (carried > 0)
+        if moving.any():
+            rows = np.repeat(np.flatnonzero(moving), carried[moving])
+            offsets = np.arange(len(rows)) - np.repeat(np.cumsum(carried[moving]) - carried[moving], carried[moving]) + 1
+            source = self._history[slots[rows], last[rows] % self.depth]
+            self._history[slots[rows], (last[rows] + offsets) % self.depth] = source
+        position = bins % self.depth
+        current = self._history[slots, position]
+        self._history[slots, position] = np.where(np.isnan(values), current, values)
+        self._n_bins[slots] += steps
+        self._last_bin[slots] = bins
+
+    def _recent(self, slots):
+        """Grid history of the given patients, newest interval first: (n, depth, 6)"""
+        lags = np.arange(self.depth)
+        positions = (self._last_bin[slots, None] - lags) % self.depth
+        return self._history[slots[:, None], positions]
+
+    def features(self, patient_ids=None):
+        """
+        (patient_ids, X) with one FEATURE_NAMES row per patient at their
+        newest grid interval; all known patients when patient_ids is None.
+        """
+        if patient_ids is None:
+            slots = np.arange(len(self._patient_ids))
+            patient_ids = np.asarray(self._patient_ids, dtype=object)
+        else:
+            slots = np.array([self._slots[patient_id] for patient_id in patient_ids], dtype=np.int64)
+        history = self._recent(slots)
+        n_bins = self._n_bins[slots]
+        latest = history[:, 0]
+
+        def trend(lag):
+            change = latest - history[:, lag]
+            enough = (n_bins > lag)[:, None]
+            return np.where(enough & ~np.isnan(change), change, 0.0)
+
+        trend_1h, trend_6h = trend(self.lag_1h), trend(self.lag_6h)
+        in_window = (np.arange(self.window) < np.minimum(n_bins, self.window)[:, None])[:, :, None]
+        window = np.where(in_window, history[:, :self.window], np.nan)
+        with np.errstate(invalid='ignore'):
+            counts = np.sum(~np.isnan(window), axis=1)
+            means = np.nansum(window, axis=1) / np.maximum(counts, 1)
+            variances = np.nansum((window - means[:, None]) ** 2, axis=1) / np.maximum(counts, 1)
+        variability = np.where(counts > 1, np.sqrt(variances), 0.0)
+
+        shock_index = latest[:, _HR] / np.maximum(latest[:, _SBP], 1.0)
+        compensatory_index = (0.5 * np.clip((shock_index - 0.5) / 0.5, 0, 1)
+                              + 0.25 * np.clip(trend_6h[:, _HR] / 20, 0, 1)
+                              + 0.25 * np.clip(trend_6h[:, _RR] / 8, 0, 1))
+
+        X = np.column_stack([
+            latest, self._static[slots],
+            trend_1h[:, _HR], trend_6h[:, _HR], trend_1h[:, _RR], trend_6h[:, _RR],
+            trend_1h[:, _SBP], trend_6h[:, _SBP], trend_1h[:, _SPO2], trend_6h[:, _SPO2],
+            variability[:, _HR], variability[:, _SBP], compensatory_index
+        ])
+        return patient_ids, X
+
+    def feature_frame(self, patient_ids=None):
+        """features() as a DataFrame indexed by patient_id"""
+        import pandas as pd
+
+        patient_ids, X = self.features(patient_ids)
+        return pd.DataFrame(X, columns=FEATURE_NAMES, index=pd.Index(patient_ids, name='patient_id'))
+
+def build_features(samples, interval_minutes=15):
+    """
+    One-shot feature table from a long DataFrame of raw samples with
+    patient_id, timestamp and any of the TREND_VITALS columns (plus optional
+    age and gender). Returns one FEATURE_NAMES row per patient.
+    """
+    builder = VitalsFeatureBuilder(interval_minutes=interval_minutes)
+    values = np.column_stack([
+        samples[vital].to_numpy(dtype=float) if vital in samples.columns else np.full(len(samples), np.nan)
+        for vital in TREND_VITALS
+    ])
+    timestamps = samples['timestamp'].to_numpy()
+    if not np.issubdtype(timestamps.dtype, np.number):
+        timestamps = timestamps.astype('datetime64[ms]')
+    builder.update(samples['patient_id'].to_numpy(), timestamps, values)
+    if 'age' in samples.columns or 'gender' in samples.columns:
+        static = samples.groupby('patient_id', sort=False).last()
+        builder.set_static(static.index.to_numpy(),
+                           age=static['age'].to_numpy() if 'age' in static else None,
+                           gender=static['gender'].to_numpy() if 'gender' in static else None)
+    return builder.feature_frame()
@@ -0,0 +1,47 @@
+"""
+Measure how long `import cardiac` takes in a fresh interpreter and which heavy
+modules it drags in. Run `python -m cardiac.import_budget`; it exits non-zero
+when the import is over budget or loads a forbidden module.
+"""
+
+import json
+import subprocess
+import sys
+
+IMPORT_TIME_BUDGET_S = 0.3
+
+# Modules the headless package must not load at import time
+FORBIDDEN_AT_IMPORT = ['matplotlib', 'seaborn', 'IPython', 'sklearn', 'pandas']
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+def measure_import_time(module='cardiac', repeats=3):
+    """Best-of-`repeats` import time of `module` and the forbidden modules it loaded"""
+    best = None
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, forbidden=FORBIDDEN_AT_IMPORT)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+def check_import_budget(module='cardiac', budget_seconds=IMPORT_TIME_BUDGET_S):
+    result = measure_import_time(module)
+    ok = result['seconds'] <= budget_seconds and not result['loaded']
+    status = "✅" if ok else "❌"
+    print(f"{status} import {module}: {result['seconds'] * 1000:.0f} ms (budget {budget_seconds * 1000:.0f} ms)")
+    if result['loaded']:
+        print(f"   loaded at import time: {', '.join(result['loaded'])}")
+    return ok
+
+if __name__ == '__main__':
+    sys.exit(0 if check_import_budget() else 1)
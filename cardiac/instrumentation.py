@@ -0,0 +1,252 @@
+"""
+Low-overhead instrumentation of phase predictions: latency histograms per
+batch size, counts per predicted phase and streaming per-feature summaries
+compared with the statistics the scaler was fitted on (drift).
+
+The prediction hot path only appends the call's inputs to a pending list;
+aggregation happens in vectorized flushes every `flush_rows` rows or when a
+snapshot is taken. Install a monitor with set_prediction_monitor() (or
+monitor.install()) and read it with snapshot(), dump() or prometheus().
+"""
+
+import json
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from .predictor import set_prediction_monitor
+from .schema import FEATURE_NAMES, PHASE_LABELS
+
+# Upper bounds of the latency histogram buckets, in seconds (the last bucket is unbounded)
+DEFAULT_LATENCY_BOUNDS_S = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                            0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+# Mean shift, in training standard deviations, beyond which a feature counts as drifted
+DEFAULT_DRIFT_THRESHOLD = 0.5
+
+def batch_size_bucket(size):
+    """Power-of-two batch-size bucket label: "1", "2", "3-4", "5-8", ..."""
+    upper = 1 << (size - 1).bit_length()
+    return str(upper) if upper <= 2 else f"{upper // 2 + 1}-{upper}"
+
+def _histogram_quantile(bounds, counts, q):
+    """Estimate a quantile from bucket counts by linear interpolation within the bucket"""
+    total = counts.sum()
+    if total == 0:
+        return None
+    rank = q * total
+    cumulative = np.cumsum(counts)
+    i = int(np.searchsorted(cumulative, rank))
+    lower = bounds[i - 1] if i > 0 else 0.0
+    if i >= len(bounds):
+        return bounds[-1]
+    before = cumulative[i - 1] if i > 0 else 0
+    return lower + (bounds[i] - lower) * (rank - before) / counts[i]
+
+class PredictionMonitor:
+    """
+    Aggregates every recorded prediction call. `scaler` is the fitted
+    StandardScaler of the model (its mean_/scale_ are the training
+    statistics drift is measured against); raw, unscaled features are
+    recorded.
+    """
+    def __init__(self, scaler=None, feature_names=None, latency_bounds_s=None,
+                 drift_threshold=DEFAULT_DRIFT_THRESHOLD, flush_rows=4096):
+        self.feature_names = list(feature_names or FEATURE_NAMES)
+        self.latency_bounds = np.asarray(latency_bounds_s or DEFAULT_LATENCY_BOUNDS_S, dtype=float)
+        self.drift_threshold = drift_threshold
+        self.flush_rows = flush_rows
+        self.training_mean = None if scaler is None else np.asarray(scaler.mean_, dtype=float)
+        self.training_std = None if scaler is None else np.asarray(scaler.scale_, dtype=float)
+        self._pending_lock = threading.Lock()
+        self._aggregate_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        n_features = len(self.feature_names)
+        with self._pending_lock, self._aggregate_lock:
+            self._pending = []
+            self._pending_rows = 0
+            self.started_at = datetime.now().isoformat()
+            self.calls = 0
+            self.rows = 0
+            # batch-size bucket -> [bucket counts, sum of seconds, calls]
+            self._latency = {}
+            self._phase_counts = np.zeros(len(PHASE_LABELS), dtype=np.int64)
+            self._count = np.zeros(n_features, dtype=np.int64)
+            self._mean = np.zeros(n_features)
+            self._m2 = np.zeros(n_features)
+            self._min = np.full(n_features, np.inf)
+            self._max = np.full(n_features, -np.inf)
+            self._missing = np.zeros(n_features, dtype=np.int64)
+
+    def install(self):
+        """Record every predict_patient_phase(s) call from now on"""
+        set_prediction_monitor(self)
+        return self
+
+    def record(self, matrix, phase_codes, seconds):
+        """Hot path: remember one call; aggregation is deferred to flush()"""
+        with self._pending_lock:
+            self._pending.append((matrix.copy(), phase_codes, seconds))
+            self._pending_rows += len(matrix)
+            due = self._pending_rows >= self.flush_rows
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Fold all pending calls into the histograms and feature summaries"""
+        with self._pending_lock:
+            pending, self._pending, self._pending_rows = self._pending, [], 0
+        if not pending:
+            return
+        sizes = np.array([len(matrix) for matrix, _, _ in pending])
+        seconds = np.array([elapsed for _, _, elapsed in pending])
+        buckets = np.searchsorted(self.latency_bounds, seconds, side='left')
+        X = np.concatenate([matrix for matrix, _, _ in pending])
+        codes = np.concatenate([np.asarray(phase_codes, dtype=np.int64) for _, phase_codes, _ in pending])
+
+        with self._aggregate_lock:
+            self.calls += len(pending)
+            self.rows += len(X)
+            for upper in np.unique(1 << np.ceil(np.log2(np.maximum(sizes, 1))).astype(np.int64)):
+                in_bucket = (sizes > upper // 2) & (sizes <= upper)
+                label = batch_size_bucket(int(upper))
+                counts, total, calls = self._latency.get(label, (np.zeros(len(self.latency_bounds) + 1, dtype=np.int64), 0.0, 0))
+                counts += np.bincount(buckets[in_bucket], minlength=len(counts))
+                self._latency[label] = (counts, total + float(seconds[in_bucket].sum()), calls + int(in_bucket.sum()))
+            self._phase_counts += np.bincount(codes, minlength=len(PHASE_LABELS))[:len(PHASE_LABELS)]
+            self._merge_features(X)
+
+    def _merge_features(self, X):
+        # Chan et al. parallel merge of the batch mean/M2 into the running ones
+        present = ~np.isnan(X)
+        n = present.sum(axis=0)
+        if n.min() == len(X):
+            batch_mean = X.mean(axis=0)
+            batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+            batch_min, batch_max = X.min(axis=0), X.max(axis=0)
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                batch_mean = np.where(n > 0, np.nansum(X, axis=0) / np.maximum(n, 1), 0.0)
+                batch_m2 = np.nansum((X - batch_mean) ** 2, axis=0)
+                batch_min = np.where(n > 0, np.nanmin(np.where(present, X, np.inf), axis=0), np.inf)
+                batch_max = np.where(n > 0, np.nanmax(np.where(present, X, -np.inf), axis=0), -np.inf)
+        total = self._count + n
+        delta = batch_mean - self._mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, n / np.maximum(total, 1), 0.0)
+        self._mean += delta * weight
+        self._m2 += batch_m2 + delta ** 2 * self._count * weight
+        self._count = total
+        self._missing += len(X) - n
+        np.minimum(self._min, batch_min, out=self._min)
+        np.maximum(self._max, batch_max, out=self._max)
+
+    def snapshot(self):
+        """All metrics as a JSON-serializable dict"""
+        self.flush()
+        with self._aggregate_lock:
+            latency = {}
+            all_counts = np.zeros(len(self.latency_bounds) + 1, dtype=np.int64)
+            all_seconds = 0.0
+            for label, (counts, total, calls) in sorted(self._latency.items(), key=lambda item: int(item[0].split('-')[-1])):
+                latency[label] = self._latency_summary(counts, total, calls)
+                all_counts += counts
+                all_seconds += total
+            latency['all'] = self._latency_summary(all_counts, all_seconds, self.calls)
+
+            count = self._count
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(np.where(count > 0, self._m2 / np.maximum(count, 1), np.nan))
+                mean = np.where(count > 0, self._mean, np.nan)
+            features = {}
+            drifted = []
+            for i, name in enumerate(self.feature_names):
+                summary = {
+                    'count': int(count[i]),
+                    'missing': int(self._missing[i]),
+                    'mean': _json_float(mean[i]),
+                    'std': _json_float(std[i]),
+                    'min': _json_float(self._min[i]) if count[i] else None,
+                    'max': _json_float(self._max[i]) if count[i] else None
+                }
+                if self.training_mean is not None:
+                    z = (mean[i] - self.training_mean[i]) / self.training_std[i]
+                    summary.update({
+                        'training_mean': float(self.training_mean[i]),
+                        'training_std': float(self.training_std[i]),
+                        'drift_z': _json_float(z),
+                        'std_ratio': _json_float(std[i] / self.training_std[i]),
+                        'drifted': bool(count[i] and abs(z) > self.drift_threshold)
+                    })
+                    if summary['drifted']:
+                        drifted.append(name)
+                features[name] = summary
+            return {
+                'started_at': self.started_at,
+                'calls': self.calls,
+                'rows': self.rows,
+                'latency': latency,
+                'phase_counts': {str(phase): int(n) for phase, n in zip(PHASE_LABELS, self._phase_counts)},
+                'features': features,
+                'drifted_features': drifted,
+                'drift_threshold': self.drift_threshold
+            }
+
+    def _latency_summary(self, counts, total_seconds, calls):
+        bounds = self.latency_bounds
+        quantile = lambda q: _ms(_histogram_quantile(bounds, counts, q))
+        return {
+            'calls': int(calls),
+            'mean_ms': total_seconds / calls * 1000 if calls else None,
+            'p50_ms': quantile(0.5),
+            'p95_ms': quantile(0.95),
+            'p99_ms': quantile(0.99),
+            'histogram': {f"le_{bound:g}": int(n) for bound, n in zip(list(bounds) + [float('inf')], np.cumsum(counts))}
+        }
+
+    def dump(self, path):
+        """Write snapshot() to a JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def prometheus(self):
+        """The metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP cardiac_prediction_latency_seconds Latency of prediction calls by batch size',
+            '# TYPE cardiac_prediction_latency_seconds histogram'
+        ]
+        with self._aggregate_lock:
+            latency = [(label, np.cumsum(counts), total, calls) for label, (counts, total, calls) in self._latency.items()]
+        for label, cumulative, total, calls in latency:
+            for bound, n in zip(list(self.latency_bounds) + [float('inf')], cumulative):
+                le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                lines.append(f'cardiac_prediction_latency_seconds_bucket{{batch_size="{label}",le="{le}"}} {n}')
+            lines.append(f'cardiac_prediction_latency_seconds_sum{{batch_size="{label}"}} {total}')
+            lines.append(f'cardiac_prediction_latency_seconds_count{{batch_size="{label}"}} {calls}')
+
+        lines += ['# HELP cardiac_predicted_phase_total Predictions per phase',
+                  '# TYPE cardiac_predicted_phase_total counter']
+        lines += [f'cardiac_predicted_phase_total{{phase="{phase}"}} {n}'
+                  for phase, n in snapshot['phase_counts'].items()]
+
+        gauges = [('feature_mean', 'mean', 'Mean of incoming raw feature values'),
+                  ('feature_std', 'std', 'Standard deviation of incoming raw feature values'),
+                  ('feature_missing_total', 'missing', 'Missing incoming feature values'),
+                  ('feature_drift_z', 'drift_z', 'Mean shift from training data in training standard deviations')]
+        for metric, key, description in gauges:
+            lines += [f'# HELP cardiac_{metric} {description}', f'# TYPE cardiac_{metric} gauge']
+            for name, summary in snapshot['features'].items():
+                if summary.get(key) is not None:
+                    lines.append(f'cardiac_{metric}{{feature="{name}"}} {summary[key]}')
+        return '\n'.join(lines) + '\n'
+
+def _json_float(value):
+    value = float(value)
+    return None if np.isnan(value) or np.isinf(value) else value
+
+def _ms(seconds):
+    return None if seconds is None else float(seconds) * 1000
@@ -0,0 +1,176 @@
+"""Asynchronous multi-patient monitoring"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from .predictor import predict_patient_phases
+from .trends import VitalsTrendBuffer
+
+# (vital, baseline, change over a full 36-hour deterioration, noise sd, lower, upper)
+SIMULATED_VITALS = [
+    ('heart_rate', 75, 50, 5, 50, 150),
+    ('respiratory_rate', 16, 15, 2, 10, 30),
+    ('systolic_bp', 120, -40, 8, 70, 180),
+    ('diastolic_bp', 80, -20, 5, 50, 110),
+    ('oxygen_saturation', 98, -10, 1, 75, 100),
+    ('body_temperature', 98.6, -1.5, 0.3, 96.0, 100.0)
+]
+SIMULATED_VITAL_NAMES = [vital[0] for vital in SIMULATED_VITALS]
+_BASELINE, _DRIFT, _NOISE, _LOWER, _UPPER = (np.array(values, dtype=float) for values in list(zip(*SIMULATED_VITALS))[1:])
+
+def simulate_vitals(simulation_time, rng=np.random):
+    """Simulated raw vital signs of a patient deteriorating over a 36-hour cycle"""
+    deterioration_factor = simulation_time / (36 * 60)
+    vitals = {
+        name: max(lower, min(upper, baseline + deterioration_factor * drift + rng.normal(0, noise)))
+        for name, baseline, drift, noise, lower, upper in SIMULATED_VITALS
+    }
+    vitals.update(age=65, gender=1)
+    return vitals
+
+def simulate_ward_vitals(simulation_times, rng):
+    """simulate_vitals for many patients at once: an N x 6 array in SIMULATED_VITAL_NAMES order"""
+    deterioration_factor = np.asarray(simulation_times, dtype=float)[:, None] / (36 * 60)
+    noise = rng.normal(0, _NOISE, size=(len(deterioration_factor), len(SIMULATED_VITALS)))
+    return np.clip(_BASELINE + deterioration_factor * _DRIFT + noise, _LOWER, _UPPER)
+
+class MonitoredPatient:
+    """Monitoring state of one patient: rolling history, cycle clock and last result"""
+    def __init__(self, patient_id, age=65, gender=1, capacity=144):
+        self.patient_id = patient_id
+        self.static_features = {'age': age, 'gender': gender}
+        self.trend_buffer = VitalsTrendBuffer(capacity=capacity)
+        self.cycle_readings = 0
+        self.readings_since_analysis = 0
+        self.latest_vitals = None
+        self.predicted_phase = None
+        self.risk_level = None
+
+class WardMonitor:
+    """
+    Monitors many patients from one asyncio event loop. Readings are queued as
+    they arrive and folded into each patient's trend buffer; on every tick all
+    patients with a full analysis interval of new readings are scored together
+    in one batched model call off the event loop. Each patient keeps the
+    15-minute reading / 2-hour analysis / 36-hour reset cycle.
+    """
+    def __init__(self, model, preprocessor, interval_minutes=15, analysis_interval_minutes=120,
+                 reset_interval_minutes=36 * 60, time_scale=900, on_analysis=None):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.interval_minutes = interval_minutes
+        self.readings_per_analysis = analysis_interval_minutes // interval_minutes
+        self.readings_per_cycle = reset_interval_minutes // interval_minutes
+        # time_scale simulated seconds pass per real second (900: 15 minutes per second)
+        self.tick_seconds = interval_minutes * 60 / time_scale
+        self.on_analysis = on_analysis
+        self.patients = {}
+        self._due = set()
+        self._queue = asyncio.Queue()
+        self.stats = {
+            'readings_ingested': 0,
+            'ticks': 0,
+            'batches_scored': 0,
+            'patients_scored': 0,
+            'last_batch_size': 0,
+            'last_tick_lag_s': 0.0,
+            'max_tick_lag_s': 0.0,
+            'scoring_seconds': 0.0,
+            'last_throughput_per_s': 0.0
+        }
+
+    def add_patient(self, patient_id, age=65, gender=1):
+        self.patients[patient_id] = MonitoredPatient(
+            patient_id, age=age, gender=gender, capacity=max(self.readings_per_cycle, 25))
+        return self.patients[patient_id]
+
+    async def submit(self, patient_id, vitals):
+        """Queue a new reading for a patient"""
+        await self._queue.put((patient_id, vitals))
+
+    def cycle_minutes(self, patient_id):
+        return self.patients[patient_id].cycle_readings * self.interval_minutes
+
+    def ingest(self, patient_id, vitals):
+        """Fold one reading into the patient's state (constant time)"""
+        patient = self.patients[patient_id]
+        if patient.cycle_readings >= self.readings_per_cycle:
+            patient.trend_buffer.reset()
+            patient.cycle_readings = 0
+            patient.readings_since_analysis = 0
+
+        patient.trend_buffer.append(vitals)
+        # Readings that already carry trend features (e.g. from a feature builder) keep them
+        patient.latest_vitals = {**patient.static_features, **patient.trend_buffer.trend_features(), **vitals}
+        patient.cycle_readings += 1
+        patient.readings_since_analysis += 1
+        if patient.readings_since_analysis >= self.readings_per_analysis:
+            self._due.add(patient_id)
+        self.stats['readings_ingested'] += 1
+
+    async def analyze_due(self):
+        """Score every due patient in a single batched prediction"""
+        if not self._due:
+            return []
+        due = [self.patients[patient_id] for patient_id in self._due]
+        self._due.clear()
+        features = [patient.latest_vitals for patient in due]
+        for patient in due:
+            patient.readings_since_analysis = 0
+
+        started = time.perf_counter()
+        phases, risks = await asyncio.get_running_loop().run_in_executor(
+            None, predict_patient_phases, features, self.model,
+            self.preprocessor.scaler, self.preprocessor.feature_names)
+        elapsed = time.perf_counter() - started
+
+        results = []
+        for patient, phase, risk in zip(due, phases, risks):
+            patient.predicted_phase, patient.risk_level = str(phase), str(risk)
+            results.append(patient)
+
+        self.stats['batches_scored'] += 1
+        self.stats['patients_scored'] += len(due)
+        self.stats['last_batch_size'] = len(due)
+        self.stats['scoring_seconds'] += elapsed
+        self.stats['last_throughput_per_s'] = len(due) / elapsed if elapsed > 0 else float('inf')
+        if self.on_analysis:
+            self.on_analysis(self, results)
+        return results
+
+    async def _ingest_loop(self):
+        while True:
+            patient_id, vitals = await self._queue.get()
+            self.ingest(patient_id, vitals)
+
+    async def _analysis_loop(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick_seconds
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            lag = loop.time() - next_tick
+            next_tick += self.tick_seconds
+            self.stats['ticks'] += 1
+            self.stats['last_tick_lag_s'] = lag
+            self.stats['max_tick_lag_s'] = max(self.stats['max_tick_lag_s'], lag)
+            await self.analyze_due()
+
+    async def run(self, *feeders):
+        """Run ingestion, the analysis ticker and the given reading feeders until cancelled"""
+        tasks = [asyncio.create_task(self._ingest_loop()), asyncio.create_task(self._analysis_loop())]
+        tasks += [asyncio.create_task(feeder) for feeder in feeders]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+async def simulate_ward_readings(monitor, seed=None):
+    """Feed one simulated reading per patient every reading interval"""
+    rng = np.random.default_rng(seed)
+    while True:
+        for patient_id in monitor.patients:
+            await monitor.submit(patient_id, simulate_vitals(monitor.cycle_minutes(patient_id), rng))
+        await asyncio.sleep(monitor.tick_seconds)
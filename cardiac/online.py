@@ -0,0 +1,203 @@
+"""
+Incremental (online) learning for the phase classifier. New labeled readings
+are absorbed in mini-batches with partial_fit instead of refitting on the
+whole history.
+"""
+
+import copy
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.preprocessing import StandardScaler
+
+from .predictor import _patients_to_matrix
+from .preprocessing import CardiacDataPreprocessor
+from .registry import MODEL_REGISTRY_DIR, CardiacModelRegistry
+from .schema import PHASE_MAP
+
+ONLINE_MODEL_NAME = 'Online SGD Logistic Regression'
+# Checkpoints live apart from the serving registry, which loads its newest
+# version; an online model only goes live through promote()
+ONLINE_CHECKPOINT_DIR = os.path.join(MODEL_REGISTRY_DIR, 'online_checkpoints')
+
+class OnlineCardiacLearner:
+    """
+    Logistic regression trained by SGD with a running StandardScaler. Each
+    mini-batch first updates the scaler's mean/variance, then takes one
+    partial_fit step, so the cost of an update depends on the batch size only.
+    Missing values are imputed with the running mean (a running median is not
+    available incrementally). Passing an already fitted `preprocessor`
+    freezes the imputer and scaler instead, as out-of-core training does
+    after a full statistics pass.
+
+    Every `checkpoint_every` batches the model is saved to `registry` (a
+    checkpoint registry such as ONLINE_CHECKPOINT_DIR, not the serving one)
+    and scored on `holdout` on a background thread; results land in
+    `self.evaluations`.
+    """
+    def __init__(self, registry=None, holdout=None, checkpoint_every=50, random_state=42,
+                 preprocessor=None, **sgd_params):
+        self.update_statistics = preprocessor is None
+        if preprocessor is None:
+            preprocessor = CardiacDataPreprocessor()
+            preprocessor.scaler = StandardScaler()
+        self.preprocessor = preprocessor
+        self.feature_names = self.preprocessor.feature_names
+        self.classes = np.array(sorted(PHASE_MAP.values()))
+        params = {'loss': 'log_loss', 'alpha': 1e-4, 'random_state': random_state}
+        params.update(sgd_params)
+        self.model = SGDClassifier(**params)
+        self.registry = registry
+        self.checkpoint_every = checkpoint_every
+        self.holdout = None
+        if holdout is not None:
+            X_holdout, y_holdout = holdout
+            self.holdout = (_patients_to_matrix(X_holdout, self.feature_names), self._labels(y_holdout))
+
+        self.batches_seen = 0
+        self.rows_seen = 0
+        self.checkpoints = []
+        self.evaluations = []
+        self._lock = threading.Lock()
+        self._evaluator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='online-eval')
+        self._pending_evaluations = []
+
+    def _labels(self, y):
+        y = np.asarray(y)
+        if y.dtype.kind in 'OUS':
+            y = np.array([PHASE_MAP[label] for label in y])
+        return y.astype(int)
+
+    def _impute(self, X):
+        if not self.update_statistics:
+            return self.preprocessor.imputer.transform(X)
+        missing = np.isnan(X)
+        if missing.any():
+            fill = self.preprocessor.scaler.mean_ if self.rows_seen else np.zeros(X.shape[1])
+            X = np.where(missing, fill, X)
+        return X
+
+    def partial_fit(self, patients, phases):
+        """Absorb one mini-batch of labeled readings (dicts, DataFrame or N x 19 array)"""
+        X = _patients_to_matrix(patients, self.feature_names)
+        y = self._labels(phases)
+        if len(X) == 0:
+            return self
+        with self._lock:
+            X = self._impute(X)
+            scaler = self.preprocessor.scaler
+            if self.update_statistics:
+                scaler.partial_fit(X)
+            self.model.partial_fit(scaler.transform(X), y, classes=self.classes)
+            self.batches_seen += 1
+            self.rows_seen += len(X)
+            due = self.checkpoint_every and self.batches_seen % self.checkpoint_every == 0
+        if due:
+            self.checkpoint()
+        return self
+
+    def fit_stream(self, chunks, batch_size=10_000):
+        """Train over an iterable of labeled DataFrame chunks (e.g. iter_cardiac_cohort)"""
+        for chunk in chunks:
+            for start in range(0, len(chunk), batch_size):
+                batch = chunk.iloc[start:start + batch_size]
+                self.partial_fit(batch[self.feature_names], batch['physiological_phase'].to_numpy())
+        return self
+
+    def predict(self, X):
+        """Phase codes for raw (unscaled) feature rows"""
+        with self._lock:
+            scaler, model = self.preprocessor.scaler, self.model
+            return model.predict(scaler.transform(self._impute(np.asarray(X, dtype=float))))
+
+    def snapshot(self):
+        """An independent copy of (model, scaler) that later updates cannot change"""
+        with self._lock:
+            return copy.deepcopy(self.model), copy.deepcopy(self.preprocessor.scaler)
+
+    def evaluate_async(self):
+        """Score a snapshot on the holdout set without blocking training"""
+        if self.holdout is None or self.rows_seen == 0:
+            return None
+        model, scaler = self.snapshot()
+        batches_seen, rows_seen = self.batches_seen, self.rows_seen
+        X_holdout, y_holdout = self.holdout
+        X_holdout = self._impute(X_holdout)
+
+        def evaluate():
+            result = {
+                'batches_seen': batches_seen,
+                'rows_seen': rows_seen,
+                'accuracy': float(accuracy_score(y_holdout, model.predict(scaler.transform(X_holdout)))),
+                'evaluated_at': datetime.now().isoformat()
+            }
+            self.evaluations.append(result)
+            return result
+
+        future = self._evaluator.submit(evaluate)
+        self._pending_evaluations.append(future)
+        return future
+
+    def _save(self, registry):
+        model, scaler = self.snapshot()
+        preprocessor = CardiacDataPreprocessor()
+        preprocessor.scaler = scaler
+        if self.update_statistics:
+            # Bundles must carry a fitted imputer; the running means are what _impute fills with
+            preprocessor.imputer.fit(scaler.mean_.reshape(1, -1))
+        else:
+            preprocessor.imputer = self.preprocessor.imputer
+        metrics = {'rows_seen': self.rows_seen, 'batches_seen': self.batches_seen}
+        if self.evaluations:
+            metrics['holdout_accuracy'] = self.evaluations[-1]['accuracy']
+        return registry.save(model, ONLINE_MODEL_NAME, preprocessor, metrics=metrics)
+
+    def checkpoint(self):
+        """Save the current model to the checkpoint registry and start a holdout evaluation"""
+        if self.rows_seen == 0:
+            return None
+        version = None
+        if self.registry is not None:
+            version = self._save(self.registry)
+            self.checkpoints.append(version)
+        self.evaluate_async()
+        return version
+
+    def promote(self, registry=None):
+        """Publish the current model to the serving registry; returns its version there"""
+        if self.rows_seen == 0:
+            return None
+        return self._save(registry or CardiacModelRegistry())
+
+    def wait_for_evaluations(self):
+        """Block until every background evaluation has finished; returns their results"""
+        results = [future.result() for future in self._pending_evaluations]
+        self._pending_evaluations = []
+        return results
+
+    def close(self):
+        self._evaluator.shutdown(wait=True)
+
+def resume_online_learner(registry=None, **kwargs):
+    """
+    Continue online training from the newest compatible checkpoint in
+    `registry` (ONLINE_CHECKPOINT_DIR by default), or start fresh if there is
+    none.
+    """
+    registry = registry or CardiacModelRegistry(ONLINE_CHECKPOINT_DIR)
+    learner = OnlineCardiacLearner(registry=registry, **kwargs)
+    bundle = registry.load(model_name=ONLINE_MODEL_NAME)
+    if bundle is not None:
+        # Memory-mapped arrays are read-only; partial_fit needs writable copies
+        learner.model = copy.deepcopy(bundle['model'])
+        learner.preprocessor.scaler = copy.deepcopy(bundle['scaler'])
+        learner.rows_seen = int(bundle['metrics'].get('rows_seen', learner.preprocessor.scaler.n_samples_seen_))
+        learner.batches_seen = int(bundle['metrics'].get('batches_seen', 0))
+        print(f"✅ Resumed online learning from model version {bundle['version']} "
+              f"({learner.rows_seen} readings seen)")
+    return learner
@@ -0,0 +1,63 @@
+"""Vectorized phase and risk prediction"""
+
+import time
+from operator import itemgetter
+
+import numpy as np
+
+from .schema import PHASE_LABELS, RISK_LABELS
+
+# Optional PredictionMonitor that every prediction call reports to
+_prediction_monitor = None
+
+def set_prediction_monitor(monitor):
+    """Report the latency, phases and inputs of every prediction to `monitor` (None stops)"""
+    global _prediction_monitor
+    _prediction_monitor = monitor
+
+def _patients_to_matrix(patients, feature_names):
+    """Stack a list of vitals dicts or an N x len(feature_names) array into one float matrix"""
+    if isinstance(patients, np.ndarray) or hasattr(patients, 'columns'):
+        if hasattr(patients, 'columns'):
+            missing_features = set(feature_names) - set(patients.columns)
+            if missing_features:
+                raise ValueError(f"Missing features: {missing_features}")
+            patients = patients[feature_names].to_numpy()
+        matrix = np.asarray(patients, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[1] != len(feature_names):
+            raise ValueError(f"Expected an N x {len(feature_names)} array, got shape {matrix.shape}")
+        return matrix
+
+    get_features = itemgetter(*feature_names)
+    try:
+        return np.array([get_features(patient) for patient in patients], dtype=float).reshape(-1, len(feature_names))
+    except KeyError:
+        for patient in patients:
+            missing_features = set(feature_names) - set(patient)
+            if missing_features:
+                raise ValueError(f"Missing features: {missing_features}")
+        raise
+
+def predict_patient_phases(patients, model, scaler, feature_names):
+    """
+    Predict the clinical phase and risk level for a whole ward in one pass.
+    `patients` is a list of vitals dicts, a DataFrame or an N x 19 array whose
+    columns follow `feature_names`. Pass scaler=None for a compiled model that
+    scales internally. Returns two arrays of length N.
+    """
+    monitor = _prediction_monitor
+    started = time.perf_counter() if monitor is not None else 0.0
+    matrix = _patients_to_matrix(patients, feature_names)
+    if len(matrix) == 0:
+        return np.array([], dtype=PHASE_LABELS.dtype), np.array([], dtype=RISK_LABELS.dtype)
+
+    features = matrix if scaler is None else scaler.transform(matrix)
+    predicted_phase_nums = np.asarray(model.predict(features), dtype=int)
+    if monitor is not None:
+        monitor.record(matrix, predicted_phase_nums, time.perf_counter() - started)
+    return PHASE_LABELS[predicted_phase_nums], RISK_LABELS[predicted_phase_nums]
+
+def predict_patient_phase(patient_data, model, scaler, feature_names):
+    """Predict the clinical phase for a patient based on the trained model"""
+    predicted_phases, risk_levels = predict_patient_phases([patient_data], model, scaler, feature_names)
+    return str(predicted_phases[0]), str(risk_levels[0])
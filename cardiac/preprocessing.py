@@ -0,0 +1,100 @@
+"""Imputation and scaling of the cardiac model features"""
+
+import numpy as np
+
+from .schema import FEATURE_NAMES, INVERSE_PHASE_MAP, PHASE_MAP
+
+class CardiacDataPreprocessor:
+    def __init__(self):
+        # sklearn is only needed once a preprocessor is built, not to import the package
+        from sklearn.impute import SimpleImputer
+        from sklearn.preprocessing import StandardScaler
+
+        self.scaler = StandardScaler()
+        self.imputer = SimpleImputer(strategy='median')
+        self.feature_names = list(FEATURE_NAMES)
+        self.phase_map = dict(PHASE_MAP)
+        self.inverse_phase_map = dict(INVERSE_PHASE_MAP)
+
+    def preprocess(self, df):
+        import pandas as pd
+
+        print("🔄 Preprocessing data...")
+        X = df[self.feature_names].to_numpy()
+        # Convert categorical labels to numerical for the model
+        y = df['physiological_phase'].map(self.phase_map).copy()
+        # Fit on plain arrays so scoring raw matrices later needs no column names
+        X_imputed = self.imputer.fit_transform(X)
+        X_scaled = pd.DataFrame(self.scaler.fit_transform(X_imputed), columns=self.feature_names)
+        print("✅ Data preprocessing completed")
+        return X_scaled, y
+
+    def preprocess_compact(self, df, dtype=np.float32):
+        """
+        Low-memory variant of preprocess() returning plain arrays (X, y). The
+        features are written once into a column-major float32 matrix and each
+        column is imputed and scaled in place while it is in cache, so the
+        only full-size allocation is X itself (no float64 copies, no
+        intermediate DataFrames). Column order is self.feature_names.
+
+        The fitted imputer and scaler hold the same statistics as preprocess()
+        up to float32 rounding (they are computed from the float32 columns),
+        so models trained either way agree on raw rows except for the rare row
+        that sits on a decision boundary.
+        """
+        print("🔄 Preprocessing data (compact)...")
+        n_rows, n_features = len(df), len(self.feature_names)
+        X = np.empty((n_rows, n_features), dtype=dtype, order='F')
+        medians = np.zeros(n_features)
+        means = np.zeros(n_features)
+        variances = np.zeros(n_features)
+        for j, name in enumerate(self.feature_names):
+            column = X[:, j]
+            column[:] = df[name].to_numpy()
+            missing = np.isnan(column)
+            if missing.any():
+                present = column[~missing]
+                medians[j] = np.median(present) if present.size else 0.0
+                column[missing] = medians[j]
+            else:
+                medians[j] = np.median(column)
+            means[j] = column.mean(dtype=np.float64)
+            variances[j] = column.var(dtype=np.float64)
+            column -= means[j]
+            # Constant columns are left unscaled, as StandardScaler does
+            column /= np.sqrt(variances[j]) if variances[j] > 0 else 1.0
+        y = df['physiological_phase'].map(self.phase_map).to_numpy()
+        self._set_fitted_statistics(medians, means, variances, n_rows)
+        print("✅ Data preprocessing completed")
+        return X, y
+
+    def fit_store(self, store, chunk_size=500_000, median_sample_size=1_000_000, stop=None):
+        """
+        Fit the imputer and scaler on rows [0, stop) of a CohortStore without
+        loading it. Medians come from an evenly spaced row sample (exact when
+        the store is smaller than the sample); means and variances of the
+        imputed data are accumulated exactly over chunks.
+        """
+        print("🔄 Fitting preprocessing statistics over the cohort store...")
+        sample = store.sample_rows(self.feature_names, median_sample_size, stop=stop)
+        medians = np.nanmedian(sample, axis=0)
+        self.imputer.fit(np.nan_to_num(medians).reshape(1, -1))
+        for X, _ in store.iter_arrays(self.feature_names, chunk_size=chunk_size, stop=stop, dtype=np.float64):
+            self.scaler.partial_fit(self.imputer.transform(X))
+        print(f"✅ Preprocessing statistics fitted on {int(self.scaler.n_samples_seen_)} rows")
+        return self
+
+    def transform(self, X):
+        """Impute and scale raw feature rows with the fitted statistics"""
+        return self.scaler.transform(self.imputer.transform(X))
+
+    def _set_fitted_statistics(self, medians, means, variances, n_samples):
+        # A single row's median is the row itself, so the imputer learns the
+        # medians exactly; the scaler is fitted for shape and then given the
+        # statistics of the full data
+        self.imputer.fit(medians.reshape(1, -1))
+        self.scaler.fit(np.vstack([means, means]))
+        self.scaler.mean_ = means
+        self.scaler.var_ = variances
+        self.scaler.scale_ = np.where(variances > 0, np.sqrt(variances), 1.0)
+        self.scaler.n_samples_seen_ = n_samples
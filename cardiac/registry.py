@@ -0,0 +1,154 @@
+"""Persisted, versioned model bundles"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from .preprocessing import CardiacDataPreprocessor
+
+MODEL_REGISTRY_DIR = 'model_registry'
+MODEL_ARTIFACT_FORMAT = 1
+
+class CardiacModelRegistry:
+    """
+    Stores the trained model together with its fitted scaler, imputer, feature
+    order and phase map as one versioned bundle. Each version is an
+    uncompressed joblib file (so it can be memory-mapped on load) next to a
+    JSON manifest holding its checksum and schema.
+    """
+    def __init__(self, registry_dir=MODEL_REGISTRY_DIR):
+        self.registry_dir = registry_dir
+
+    def _paths(self, version):
+        stem = os.path.join(self.registry_dir, f"cardiac_phase_model_v{version}")
+        return stem + '.joblib', stem + '.json'
+
+    def versions(self):
+        if not os.path.isdir(self.registry_dir):
+            return []
+        found = []
+        for filename in os.listdir(self.registry_dir):
+            if filename.startswith('cardiac_phase_model_v') and filename.endswith('.json'):
+                version = filename[len('cardiac_phase_model_v'):-len('.json')]
+                if version.isdigit():
+                    found.append(int(version))
+        return sorted(found)
+
+    def save(self, model, model_name, preprocessor, metrics=None):
+        """Persist a trained model bundle and return its version number"""
+        import joblib
+
+        os.makedirs(self.registry_dir, exist_ok=True)
+        version = max(self.versions(), default=0) + 1
+        artifact_path, manifest_path = self._paths(version)
+
+        bundle = {
+            'model': model,
+            'model_name': model_name,
+            'scaler': preprocessor.scaler,
+            'imputer': preprocessor.imputer,
+            'feature_names': list(preprocessor.feature_names),
+            'phase_map': dict(preprocessor.phase_map)
+        }
+        # Write to a temporary file first so a crash never leaves a torn artifact
+        joblib.dump(bundle, artifact_path + '.tmp', compress=0)
+        os.replace(artifact_path + '.tmp', artifact_path)
+
+        manifest = {
+            'version': version,
+            'format': MODEL_ARTIFACT_FORMAT,
+            'model_name': model_name,
+            'created_at': datetime.now().isoformat(),
+            'sha256': _file_sha256(artifact_path),
+            'sklearn_version': _sklearn_version(),
+            'feature_names': bundle['feature_names'],
+            'phase_map': bundle['phase_map'],
+            'metrics': metrics or {}
+        }
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        print(f"💾 Saved {model_name} as model version {version} in '{self.registry_dir}'")
+        return version
+
+    def _incompatibility(self, manifest, feature_names, phase_map):
+        if manifest.get('format') != MODEL_ARTIFACT_FORMAT:
+            return f"artifact format {manifest.get('format')} != {MODEL_ARTIFACT_FORMAT}"
+        if manifest.get('sklearn_version') != _sklearn_version():
+            return f"trained with scikit-learn {manifest.get('sklearn_version')}, running {_sklearn_version()}"
+        if manifest.get('feature_names') != list(feature_names):
+            return "feature order differs from this version of the preprocessor"
+        if manifest.get('phase_map') != dict(phase_map):
+            return "phase map differs from this version of the preprocessor"
+        return None
+
+    def load(self, version=None, verify_checksum=True, model_name=None):
+        """
+        Load the newest compatible bundle (or a specific version), optionally
+        only among bundles of `model_name`. Returns None when no compatible
+        artifact exists so the caller can fall back to training.
+        """
+        reference = CardiacDataPreprocessor()
+        candidates = [version] if version is not None else reversed(self.versions())
+        for candidate in candidates:
+            artifact_path, manifest_path = self._paths(candidate)
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Skipping model version {candidate}: unreadable manifest ({e})")
+                continue
+
+            if model_name is not None and manifest.get('model_name') != model_name:
+                continue
+            reason = self._incompatibility(manifest, reference.feature_names, reference.phase_map)
+            if reason is None and not os.path.exists(artifact_path):
+                reason = "artifact file is missing"
+            if reason is None and verify_checksum and _file_sha256(artifact_path) != manifest['sha256']:
+                reason = "checksum mismatch"
+            if reason:
+                print(f"⚠️ Skipping model version {candidate}: {reason}")
+                continue
+
+            import joblib
+            bundle = joblib.load(artifact_path, mmap_mode='r')
+            bundle['version'] = candidate
+            bundle['metrics'] = manifest.get('metrics', {})
+            return bundle
+        return None
+
+def _sklearn_version():
+    import sklearn
+    return sklearn.__version__
+
+def _file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_or_train_cardiac_model(registry=None, n_patients=200):
+    """
+    Return (model, model_name, preprocessor), loading the newest compatible
+    artifact from the registry and only training when none exists.
+    """
+    registry = registry or CardiacModelRegistry()
+    bundle = registry.load()
+    preprocessor = CardiacDataPreprocessor()
+    if bundle is not None:
+        preprocessor.scaler = bundle['scaler']
+        preprocessor.imputer = bundle['imputer']
+        print(f"✅ Loaded {bundle['model_name']} (model version {bundle['version']}) without retraining")
+        return bundle['model'], bundle['model_name'], preprocessor
+
+    print("🔄 No compatible model artifact found. Training a new model...")
+    from .dataset import generate_cardiac_dataset
+    from .training import train_cardiac_models
+
+    df_train = generate_cardiac_dataset(n_patients)
+    X_train, y_train = preprocessor.preprocess_compact(df_train)
+    best_model, best_model_name = train_cardiac_models(X_train, y_train)
+    registry.save(best_model, best_model_name, preprocessor)
+    return best_model, best_model_name, preprocessor
@@ -0,0 +1,97 @@
+"""
+Off-thread trend rendering to in-memory PNG/SVG. Uses matplotlib's
+object-oriented Agg API (no pyplot, no GUI backend), downsamples long series
+with LTTB and reuses one figure per worker thread.
+"""
+
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .downsampling import downsample_series
+
+# (axis position, title, y label, [(column, line style, legend label)])
+TREND_PANELS = [
+    ((0, 0), 'Heart Rate Trend', 'BPM', [('heart_rate', 'r-o', 'Heart Rate (bpm)')]),
+    ((0, 1), 'Respiratory Rate Trend', 'Breaths/min', [('respiratory_rate', 'b-o', 'Respiratory Rate (/min)')]),
+    ((1, 0), 'Blood Pressure Trend', 'mmHg', [('systolic_bp', 'g-o', 'Systolic BP (mmHg)'),
+                                               ('diastolic_bp', 'g--o', 'Diastolic BP (mmHg)')]),
+    ((1, 1), 'Oxygen Saturation Trend', 'Percentage', [('oxygen_saturation', 'm-o', 'SpO2 (%)')])
+]
+
+class TrendRenderer:
+    """
+    Renders a patient's vitals history (a DataFrame or dict of arrays with a
+    `timestamp` column, e.g. VitalsTrendBuffer.to_frame()) to image bytes.
+    `submit` renders on a background worker and returns a Future, so the
+    monitoring loop never waits on matplotlib.
+    """
+    def __init__(self, max_points=200, max_workers=1, figsize=(14, 10), dpi=80):
+        self.max_points = max_points
+        self.figsize = figsize
+        self.dpi = dpi
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='trend-render')
+        self._local = threading.local()
+
+    def _canvas(self):
+        """The calling thread's reusable figure and its line artists"""
+        cached = getattr(self._local, 'canvas', None)
+        if cached is not None:
+            return cached
+        figure = Figure(figsize=self.figsize, dpi=self.dpi)
+        canvas = FigureCanvasAgg(figure)
+        axes = figure.subplots(2, 2)
+        title = figure.suptitle('Real-time Patient Vitals Trends', fontsize=16)
+        lines = {}
+        for (row, col), panel_title, ylabel, series in TREND_PANELS:
+            ax = axes[row, col]
+            for column, style, label in series:
+                lines[column] = (ax, ax.plot([], [], style, label=label)[0])
+            ax.set_title(panel_title)
+            ax.set_ylabel(ylabel)
+            ax.grid(True)
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d %H:%M'))
+            ax.tick_params(axis='x', rotation=45)
+            if len(series) > 1:
+                ax.legend()
+        figure.tight_layout()
+        self._local.canvas = (figure, canvas, title, lines)
+        return self._local.canvas
+
+    def render(self, history, fmt='png', title=None):
+        """Render synchronously in the calling thread and return the image bytes"""
+        figure, canvas, suptitle, lines = self._canvas()
+        suptitle.set_text(title or 'Real-time Patient Vitals Trends')
+        timestamps = np.asarray(history['timestamp'], dtype='datetime64[ms]')
+        touched = set()
+        for column, (ax, line) in lines.items():
+            x, y = downsample_series(timestamps, np.asarray(history[column], dtype=float), self.max_points)
+            line.set_data(mdates.date2num(x), y)
+            touched.add(ax)
+        for ax in touched:
+            ax.relim()
+            ax.autoscale_view()
+
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=fmt)
+        return buffer.getvalue()
+
+    def submit(self, history, fmt='png', title=None):
+        """Render on a background worker; returns a concurrent.futures.Future"""
+        return self._executor.submit(self.render, history, fmt, title)
+
+    def render_many(self, histories, fmt='png'):
+        """Render {patient_id: history} for a dashboard; returns {patient_id: bytes}"""
+        futures = {
+            patient_id: self.submit(history, fmt, f"Patient {patient_id} Vitals Trends")
+            for patient_id, history in histories.items()
+        }
+        return {patient_id: future.result() for patient_id, future in futures.items()}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
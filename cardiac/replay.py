@@ -0,0 +1,195 @@
+"""
+Time-warped replay of ward vitals streams through the monitoring and
+prediction path, as a load test. Synthetic or recorded readings for any
+number of virtual patients are pushed through WardMonitor as fast as
+possible or at a chosen speed-up over real time, and the run reports
+readings/sec, analysis latency percentiles and alert counts.
+
+    python -m cardiac.replay --patients 5000 --hours 36
+    python -m cardiac.replay --patients 500 --speedup 3600
+    python -m cardiac.replay --recorded ward_export.csv --output replay.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+
+from .monitoring import WardMonitor, simulate_ward_vitals
+from .schema import TREND_VITALS
+
+def synthetic_ward_stream(n_patients, hours=36, interval_minutes=15, seed=42, stagger=True):
+    """
+    Yield (patient_ids, vitals) per reading interval for `n_patients`
+    deteriorating patients, vitals as an N x 6 array in TREND_VITALS order.
+    With `stagger` each patient starts at a random point of the 36-hour cycle
+    so the ward is not in lockstep.
+    """
+    rng = np.random.default_rng(seed)
+    patient_ids = np.arange(1, n_patients + 1)
+    cycle_minutes = 36 * 60
+    offsets = rng.integers(0, cycle_minutes // interval_minutes, size=n_patients) * interval_minutes \
+        if stagger else np.zeros(n_patients, dtype=int)
+    for tick in range(int(hours * 60 // interval_minutes)):
+        minutes = (offsets + tick * interval_minutes) % cycle_minutes
+        yield patient_ids, simulate_ward_vitals(minutes, rng)
+
+def recorded_ward_stream(df):
+    """
+    Yield (patient_ids, vitals) per reading interval from recorded readings:
+    a DataFrame with patient_id, the TREND_VITALS columns and optionally a
+    timestamp. Each patient's n-th reading (in timestamp order) is replayed
+    in the n-th interval.
+    """
+    missing = set(['patient_id'] + TREND_VITALS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Recorded readings are missing columns: {missing}")
+    if 'timestamp' in df.columns:
+        df = df.sort_values(['timestamp', 'patient_id'], kind='stable')
+    ticks = df.groupby('patient_id', sort=False).cumcount().to_numpy()
+    patient_ids = df['patient_id'].to_numpy()
+    vitals = df[TREND_VITALS].to_numpy(dtype=float)
+    order = np.argsort(ticks, kind='stable')
+    bounds = np.searchsorted(ticks[order], np.arange(ticks.max() + 2)) if len(ticks) else [0]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        rows = order[start:stop]
+        yield patient_ids[rows], vitals[rows]
+
+def _percentiles_ms(seconds):
+    if not seconds:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    values = np.asarray(seconds) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(values.max())}
+
+class WardReplay:
+    """
+    Drives a WardMonitor from a stream of (patient_ids, vitals) intervals.
+    speedup=None replays as fast as the hardware allows; otherwise one
+    reading interval takes interval_minutes * 60 / speedup real seconds.
+    """
+    def __init__(self, model, preprocessor, speedup=None, interval_minutes=15,
+                 analysis_interval_minutes=120, reset_interval_minutes=36 * 60):
+        self.monitor = WardMonitor(model, preprocessor, interval_minutes=interval_minutes,
+                                   analysis_interval_minutes=analysis_interval_minutes,
+                                   reset_interval_minutes=reset_interval_minutes,
+                                   on_analysis=self._record_alerts)
+        self.speedup = speedup
+        self.interval_minutes = interval_minutes
+        self.alerts = {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+        self.new_high_risk_alerts = 0
+        self._last_risk = {}
+
+    def _record_alerts(self, monitor, results):
+        for patient in results:
+            self.alerts[patient.risk_level] = self.alerts.get(patient.risk_level, 0) + 1
+            if patient.risk_level == 'HIGH' and self._last_risk.get(patient.patient_id) != 'HIGH':
+                self.new_high_risk_alerts += 1
+            self._last_risk[patient.patient_id] = patient.risk_level
+
+    async def run(self, stream):
+        """Replay the whole stream and return the load report"""
+        monitor = self.monitor
+        interval_s = self.interval_minutes * 60
+        paced_interval_s = interval_s / self.speedup if self.speedup else 0.0
+        tick_seconds, analysis_seconds, ingest_seconds = [], [], 0.0
+        max_behind_s, ticks = 0.0, 0
+
+        started = time.perf_counter()
+        for tick, (patient_ids, vitals) in enumerate(stream):
+            if self.speedup:
+                delay = started + tick * paced_interval_s - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    max_behind_s = max(max_behind_s, -delay)
+            tick_started = time.perf_counter()
+            for patient_id, row in zip(patient_ids.tolist(), vitals.tolist()):
+                if patient_id not in monitor.patients:
+                    monitor.add_patient(patient_id)
+                monitor.ingest(patient_id, dict(zip(TREND_VITALS, row)))
+            analysis_started = time.perf_counter()
+            ingest_seconds += analysis_started - tick_started
+            if await monitor.analyze_due():
+                analysis_seconds.append(time.perf_counter() - analysis_started)
+            tick_seconds.append(time.perf_counter() - tick_started)
+            ticks += 1
+        wall_s = time.perf_counter() - started
+
+        readings = monitor.stats['readings_ingested']
+        simulated_s = ticks * interval_s
+        tick_latency = _percentiles_ms(tick_seconds)
+        return {
+            'patients': len(monitor.patients),
+            'intervals': ticks,
+            'simulated_hours': simulated_s / 3600,
+            'speedup': self.speedup,
+            'wall_s': wall_s,
+            'readings': readings,
+            'readings_per_s': readings / wall_s if wall_s > 0 else float('inf'),
+            'ingest_us_per_reading': ingest_seconds / readings * 1e6 if readings else None,
+            'realtime_factor': simulated_s / wall_s if wall_s > 0 else float('inf'),
+            'analyses': monitor.stats['patients_scored'],
+            'analysis_batches': monitor.stats['batches_scored'],
+            'analysis_latency_ms': _percentiles_ms(analysis_seconds),
+            'interval_latency_ms': tick_latency,
+            'max_behind_schedule_s': max_behind_s,
+            # How many times over the ward could be processed within each real reading interval
+            'realtime_headroom': interval_s * 1000 / tick_latency['max'] if tick_latency['max'] else None,
+            'alerts': dict(self.alerts),
+            'new_high_risk_alerts': self.new_high_risk_alerts
+        }
+
+def print_replay_report(report):
+    analysis, interval = report['analysis_latency_ms'], report['interval_latency_ms']
+    print(f"\n📊 Replayed {report['simulated_hours']:.1f} h for {report['patients']} patients "
+          f"in {report['wall_s']:.1f} s ({report['realtime_factor']:.0f}x real time)")
+    print(f"   readings: {report['readings']} ({report['readings_per_s']:.0f}/s, "
+          f"{report['ingest_us_per_reading']:.1f} µs each to ingest)")
+    if analysis['p50'] is not None:
+        print(f"   analysis batches: {report['analysis_batches']} | latency p50 {analysis['p50']:.1f} ms, "
+              f"p95 {analysis['p95']:.1f} ms, p99 {analysis['p99']:.1f} ms, max {analysis['max']:.1f} ms")
+    print(f"   per interval: p99 {interval['p99']:.1f} ms, max {interval['max']:.1f} ms")
+    print(f"   alerts: {report['alerts']['HIGH']} HIGH / {report['alerts']['MEDIUM']} MEDIUM / "
+          f"{report['alerts']['LOW']} LOW analyses, {report['new_high_risk_alerts']} new HIGH-risk alerts")
+    if report['speedup'] and report['max_behind_schedule_s'] > 0:
+        print(f"⚠️ Fell up to {report['max_behind_schedule_s'] * 1000:.0f} ms behind the {report['speedup']:g}x schedule")
+    if report['realtime_headroom'] is not None:
+        verdict = '✅ Keeps up' if report['realtime_headroom'] >= 1 else '❌ Cannot keep up'
+        print(f"{verdict} in real time: the slowest interval used "
+              f"{100 / report['realtime_headroom']:.3f}% of the reading interval")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patients', type=int, default=5000)
+    parser.add_argument('--hours', type=float, default=36)
+    parser.add_argument('--speedup', type=float, help='simulated seconds per real second (default: as fast as possible)')
+    parser.add_argument('--recorded', help='CSV of recorded readings (patient_id, vitals, optional timestamp)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the report as JSON to this file')
+    args = parser.parse_args(argv)
+
+    from .registry import load_or_train_cardiac_model
+    model, _, preprocessor = load_or_train_cardiac_model()
+
+    if args.recorded:
+        import pandas as pd
+        stream = recorded_ward_stream(pd.read_csv(args.recorded))
+        print(f"🔄 Replaying recorded readings from '{args.recorded}'...")
+    else:
+        stream = synthetic_ward_stream(args.patients, hours=args.hours, seed=args.seed)
+        print(f"🔄 Replaying {args.hours:g} h of synthetic readings for {args.patients} patients...")
+
+    report = asyncio.run(WardReplay(model, preprocessor, speedup=args.speedup).run(stream))
+    print_replay_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to '{args.output}'")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Patient risk reports, as text and as structured records, one at a time or in bulk"""
+
+import json
+from datetime import datetime
+
+PHASE_GUIDANCE = {
+    'decompensatory': {
+        'alerts': ["🚨 CRITICAL: Decompensatory phase detected. Body systems failing."],
+        'recommendations': ["Immediate physician evaluation required", "Activate rapid response team"]
+    },
+    'compensatory': {
+        'alerts': ["⚠️ HIGH RISK: Compensatory phase detected. Patient is under stress."],
+        'recommendations': ["Increase monitoring frequency to every 15 minutes",
+                            "Notify attending physician immediately"]
+    },
+    'normal': {
+        'alerts': ["🟢 NORMAL: Patient vitals are stable."],
+        'recommendations': ["Continue routine monitoring"]
+    }
+}
+
+REPORT_VITALS = ['heart_rate', 'respiratory_rate', 'systolic_bp', 'diastolic_bp',
+                 'oxygen_saturation', 'body_temperature']
+
+_REPORT_HEADER = """
+🏥 CARDIAC ARREST RISK ASSESSMENT REPORT
+{rule}
+📅 Timestamp: {{timestamp}}
+🆔 Patient ID: {{patient_id}}
+
+📊 RISK ASSESSMENT
+Predicted Phase: {{phase_upper}}
+Risk Level: {{risk_level}}
+
+💓 CURRENT VITAL SIGNS
+Heart Rate: {{heart_rate}} bpm
+Respiratory Rate: {{respiratory_rate}} /min
+Blood Pressure: {{systolic_bp}}/{{diastolic_bp}} mmHg
+Oxygen Saturation: {{oxygen_saturation}}%
+Body Temperature: {{body_temperature}}°F
+""".format(rule='=' * 50)
+
+def _phase_sections(guidance):
+    alerts = ''.join(f"• {alert}\n" for alert in guidance['alerts'])
+    recommendations = ''.join(f"• {rec}\n" for rec in guidance['recommendations'])
+    return f"\n🚨 ALERTS\n{alerts}\n💡 RECOMMENDATIONS\n{recommendations}{'=' * 50}"
+
+# The alert and recommendation blocks only depend on the phase, so each
+# phase's full template is assembled once at import
+_REPORT_TEMPLATES = {
+    phase: _REPORT_HEADER + _phase_sections(guidance).replace('{', '{{').replace('}', '}}')
+    for phase, guidance in PHASE_GUIDANCE.items()
+}
+
+def _render_text(patient_id, patient_data, predicted_phase_str, risk_level, timestamp):
+    template = _REPORT_TEMPLATES.get(predicted_phase_str, _REPORT_TEMPLATES['normal'])
+    return template.format(
+        timestamp=timestamp,
+        patient_id=patient_id,
+        phase_upper=predicted_phase_str.upper(),
+        risk_level=risk_level,
+        **{vital: patient_data.get(vital, 'N/A') for vital in REPORT_VITALS}
+    )
+
+def create_patient_report(patient_data, predicted_phase_str, risk_level, patient_id='Real-time Patient'):
+    """Generate a comprehensive patient report based on the predicted phase"""
+    return _render_text(patient_id, patient_data, predicted_phase_str, risk_level, datetime.now().isoformat())
+
+def build_report_record(patient_id, patient_data, predicted_phase_str, risk_level, timestamp=None):
+    """The structured (JSON-serializable) form of a patient report"""
+    guidance = PHASE_GUIDANCE.get(predicted_phase_str, PHASE_GUIDANCE['normal'])
+    return {
+        'patient_id': patient_id,
+        'timestamp': timestamp or datetime.now().isoformat(),
+        'predicted_phase': predicted_phase_str,
+        'risk_level': risk_level,
+        'vitals': {vital: _json_value(patient_data.get(vital)) for vital in REPORT_VITALS},
+        'alerts': guidance['alerts'],
+        'recommendations': guidance['recommendations']
+    }
+
+def _json_value(value):
+    # NumPy scalars are not JSON serializable
+    return value.item() if hasattr(value, 'item') else value
+
+def iter_patient_reports(entries, fmt='text', timestamp=None):
+    """
+    Yield one report per (patient_id, patient_data, phase, risk_level) entry.
+    fmt='text' yields the printable report, 'json' one JSON document per
+    patient and 'record' the structured dict. All reports of one call share
+    a timestamp, as in a shift handover.
+    """
+    timestamp = timestamp or datetime.now().isoformat()
+    for patient_id, patient_data, predicted_phase_str, risk_level in entries:
+        if fmt == 'text':
+            yield _render_text(patient_id, patient_data, predicted_phase_str, risk_level, timestamp)
+            continue
+        record = build_report_record(patient_id, patient_data, predicted_phase_str, risk_level, timestamp)
+        if fmt == 'record':
+            yield record
+        elif fmt == 'json':
+            yield json.dumps(record, ensure_ascii=False)
+        else:
+            raise ValueError(f"Unknown report format: {fmt}")
+
+def write_handover_report(entries, out, fmt='text'):
+    """
+    Stream a whole ward's reports to a file-like object: text reports are
+    separated by blank lines, json writes newline-delimited JSON. Returns the
+    number of reports written.
+    """
+    count = 0
+    separator = '\n' if fmt == 'json' else '\n\n'
+    for report in iter_patient_reports(entries, fmt=fmt):
+        out.write(report)
+        out.write(separator)
+        count += 1
+    return count
@@ -0,0 +1,78 @@
+"""Column schema, phase labels and synthetic-cohort distributions of the cardiac model"""
+
+import numpy as np
+
+DATASET_COLUMNS = [
+    'patient_id', 'heart_rate', 'respiratory_rate', 'systolic_bp', 'diastolic_bp',
+    'oxygen_saturation', 'body_temperature', 'age', 'gender',
+    'hr_trend_1h', 'hr_trend_6h', 'rr_trend_1h', 'rr_trend_6h',
+    'bp_trend_1h', 'bp_trend_6h', 'spo2_trend_1h', 'spo2_trend_6h',
+    'hr_variability', 'bp_variability', 'compensatory_index', 'physiological_phase'
+]
+
+# Columns sampled from a phase-specific normal distribution, in the order of
+# the (mean, std) pairs in PHASE_DISTRIBUTIONS.
+PHASE_SAMPLED_COLUMNS = [
+    'heart_rate', 'respiratory_rate', 'systolic_bp', 'diastolic_bp',
+    'oxygen_saturation', 'body_temperature',
+    'hr_trend_1h', 'hr_trend_6h', 'rr_trend_1h', 'rr_trend_6h',
+    'bp_trend_1h', 'bp_trend_6h', 'spo2_trend_1h', 'spo2_trend_6h',
+    'hr_variability', 'bp_variability', 'compensatory_index'
+]
+
+PHASE_DISTRIBUTIONS = {
+    'normal': [
+        (75, 10), (16, 3), (120, 15), (80, 10), (98, 1.5), (98.6, 0.8),
+        (0, 2), (0, 3), (0, 1), (0, 1.5), (0, 3), (0, 5), (0, 0.5), (0, 1),
+        (5, 2), (8, 3), (0.2, 0.1)
+    ],
+    'compensatory': [
+        (95, 15), (22, 4), (135, 20), (85, 12), (94, 3), (98.2, 1.2),
+        (8, 4), (15, 8), (3, 2), (6, 3), (5, 8), (8, 12), (-1, 1), (-2.5, 2),
+        (12, 4), (18, 6), (0.7, 0.15)
+    ],
+    'decompensatory': [
+        (110, 20), (28, 6), (95, 25), (65, 15), (88, 5), (97.5, 1.5),
+        (12, 8), (25, 15), (6, 4), (12, 6), (-8, 12), (-15, 18), (-3, 2), (-6, 4),
+        (20, 8), (25, 10), (0.9, 0.1)
+    ]
+}
+
+# Physiological limits applied after sampling
+CLINICAL_LIMITS = {
+    'heart_rate': (40, 180),
+    'respiratory_rate': (8, 40),
+    'systolic_bp': (70, 200),
+    'diastolic_bp': (40, 120),
+    'oxygen_saturation': (70, 100),
+    'body_temperature': (95, 104),
+    'compensatory_index': (0, 1),
+    'age': (18, 95)
+}
+
+SAMPLED_LOWER_LIMITS = np.array([CLINICAL_LIMITS.get(c, (-np.inf, np.inf))[0] for c in PHASE_SAMPLED_COLUMNS])
+SAMPLED_UPPER_LIMITS = np.array([CLINICAL_LIMITS.get(c, (-np.inf, np.inf))[1] for c in PHASE_SAMPLED_COLUMNS])
+
+FEATURE_NAMES = [
+    'heart_rate', 'respiratory_rate', 'systolic_bp', 'diastolic_bp',
+    'oxygen_saturation', 'body_temperature', 'age', 'gender',
+    'hr_trend_1h', 'hr_trend_6h', 'rr_trend_1h', 'rr_trend_6h',
+    'bp_trend_1h', 'bp_trend_6h', 'spo2_trend_1h', 'spo2_trend_6h',
+    'hr_variability', 'bp_variability', 'compensatory_index'
+]
+
+TREND_VITALS = [
+    'heart_rate', 'respiratory_rate', 'systolic_bp', 'diastolic_bp',
+    'oxygen_saturation', 'body_temperature'
+]
+
+PHASE_MAP = {'normal': 0, 'compensatory': 1, 'decompensatory': 2}
+INVERSE_PHASE_MAP = {0: 'normal', 1: 'compensatory', 2: 'decompensatory'}
+PHASE_LABELS = np.array(['normal', 'compensatory', 'decompensatory'])
+
+PHASE_RISK_LEVELS = {
+    'normal': 'LOW',
+    'compensatory': 'MEDIUM',
+    'decompensatory': 'HIGH'
+}
+RISK_LABELS = np.array([PHASE_RISK_LEVELS[phase] for phase in PHASE_LABELS])
@@ -0,0 +1,176 @@
+"""
+Binary columnar cohort storage. A store is a directory with one raw
+little-endian file per column and a small JSON header, so the schema can be
+checked without touching the data and columns are memory-mapped on demand.
+Cohorts far larger than RAM can then be read in bounded chunks.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from .schema import PHASE_LABELS, PHASE_MAP
+
+COHORT_STORE_FORMAT = 1
+COHORT_STORE_SUFFIX = '.cohort'
+HEADER_FILE = 'header.json'
+# Categorical columns are stored as int8 codes into these labels
+CATEGORICAL_COLUMNS = {'physiological_phase': list(PHASE_LABELS)}
+INTEGER_COLUMNS = ('patient_id',)
+
+def read_csv_columns(filepath):
+    """Column names of a CSV file, from its header line only"""
+    import pandas as pd
+    return list(pd.read_csv(filepath, nrows=0).columns)
+
+def is_cohort_store(path):
+    return os.path.isfile(os.path.join(path, HEADER_FILE))
+
+def read_store_header(path):
+    """The header of a cohort store (columns, dtypes, row count) without mapping any data"""
+    with open(os.path.join(path, HEADER_FILE), 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    if header.get('format') != COHORT_STORE_FORMAT:
+        raise ValueError(f"Unsupported cohort store format {header.get('format')!r} in '{path}'")
+    return header
+
+def _storage_dtype(name):
+    if name in CATEGORICAL_COLUMNS:
+        return np.dtype('int8')
+    if name in INTEGER_COLUMNS:
+        return np.dtype('<i8')
+    # Vitals are float32 in the compact training path anyway
+    return np.dtype('<f4')
+
+def _encode(name, values):
+    if name not in CATEGORICAL_COLUMNS:
+        return np.asarray(values, dtype=_storage_dtype(name))
+    labels = CATEGORICAL_COLUMNS[name]
+    codes = np.full(len(values), -1, dtype=np.int8)
+    for code, label in enumerate(labels):
+        codes[np.asarray(values) == label] = code
+    if (codes < 0).any():
+        unknown = set(np.asarray(values)[codes < 0].tolist())
+        raise ValueError(f"Unknown {name} values: {unknown}")
+    return codes
+
+class CohortStore:
+    """Read access to a cohort store; build one with CohortStore.write()"""
+    def __init__(self, path):
+        self.path = path
+        self.header = read_store_header(path)
+        self.columns = [column['name'] for column in self.header['columns']]
+        self.dtypes = {column['name']: np.dtype(column['dtype']) for column in self.header['columns']}
+        self.n_rows = self.header['n_rows']
+
+    def __len__(self):
+        return self.n_rows
+
+    @classmethod
+    def write(cls, path, chunks):
+        """
+        Write an iterable of DataFrame chunks to a new store at `path`
+        (replacing any existing one). Only one chunk is held in memory at a time.
+        """
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        columns, files, n_rows = None, {}, 0
+        try:
+            for chunk in chunks:
+                if columns is None:
+                    columns = list(chunk.columns)
+                    files = {name: open(os.path.join(tmp_path, f"{name}.bin"), 'wb') for name in columns}
+                for name in columns:
+                    files[name].write(_encode(name, chunk[name].to_numpy()).tobytes())
+                n_rows += len(chunk)
+        finally:
+            for f in files.values():
+                f.close()
+        if columns is None:
+            shutil.rmtree(tmp_path)
+            raise ValueError("Cannot write a cohort store without any chunks")
+
+        header = {
+            'format': COHORT_STORE_FORMAT,
+            'n_rows': n_rows,
+            'columns': [{'name': name, 'dtype': _storage_dtype(name).str} for name in columns],
+            'categories': {name: labels for name, labels in CATEGORICAL_COLUMNS.items() if name in columns}
+        }
+        with open(os.path.join(tmp_path, HEADER_FILE), 'w', encoding='utf-8') as f:
+            json.dump(header, f, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return cls(path)
+
+    def column(self, name):
+        """A read-only memory map of one column (categorical columns as codes)"""
+        if name not in self.dtypes:
+            raise KeyError(f"Column {name!r} is not in cohort store '{self.path}'")
+        if self.n_rows == 0:
+            return np.empty(0, dtype=self.dtypes[name])
+        return np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=self.dtypes[name],
+                         mode='r', shape=(self.n_rows,))
+
+    def _to_model_codes(self, codes, name='physiological_phase'):
+        to_model_code = np.array([PHASE_MAP[label] for label in self.header['categories'][name]])
+        return to_model_code[codes]
+
+    def phase_codes(self, start=0, stop=None, name='physiological_phase'):
+        """Phase labels of rows [start, stop) as model class codes (PHASE_MAP)"""
+        return self._to_model_codes(self.column(name)[start:stop], name)
+
+    def iter_chunks(self, chunk_size=100_000, columns=None, start=0, stop=None):
+        """Yield rows [start, stop) as DataFrames of at most `chunk_size` rows, labels decoded"""
+        import pandas as pd
+
+        columns = columns or self.columns
+        maps = {name: self.column(name) for name in columns}
+        stop = self.n_rows if stop is None else stop
+        for begin in range(start, stop, chunk_size):
+            end = min(begin + chunk_size, stop)
+            data = {}
+            for name, values in maps.items():
+                if name in self.header['categories']:
+                    data[name] = np.asarray(self.header['categories'][name])[values[begin:end]]
+                else:
+                    data[name] = np.array(values[begin:end])
+            yield pd.DataFrame(data, index=pd.RangeIndex(begin, end))
+
+    def iter_arrays(self, feature_names, chunk_size=100_000, start=0, stop=None, dtype=np.float32):
+        """
+        Yield (X, y) for rows [start, stop) in chunks: X column-major with
+        `feature_names` columns, y as model class codes. Only one chunk is
+        materialized at a time; the rest stays in the page cache or on disk.
+        """
+        maps = [self.column(name) for name in feature_names]
+        stop = self.n_rows if stop is None else stop
+        for begin in range(start, stop, chunk_size):
+            end = min(begin + chunk_size, stop)
+            X = np.empty((end - begin, len(maps)), dtype=dtype, order='F')
+            for j, values in enumerate(maps):
+                X[:, j] = values[begin:end]
+            yield X, self.phase_codes(begin, end)
+
+    def take_rows(self, feature_names, rows, dtype=np.float32):
+        """(X, y) for the given row indices (sorted indices read the files in order)"""
+        X = np.empty((len(rows), len(feature_names)), dtype=dtype, order='F')
+        for j, name in enumerate(feature_names):
+            X[:, j] = self.column(name)[rows]
+        return X, self._to_model_codes(self.column('physiological_phase')[rows])
+
+    def sample_rows(self, feature_names, n_samples, stop=None, dtype=np.float64):
+        """An evenly spaced sample of up to `n_samples` rows of `feature_names`"""
+        stop = self.n_rows if stop is None else stop
+        rows = np.unique(np.linspace(0, stop - 1, min(n_samples, stop)).astype(np.int64))
+        return np.column_stack([self.column(name)[rows].astype(dtype) for name in feature_names])
+
+def convert_csv_to_cohort_store(csv_path, store_path, chunk_size=500_000):
+    """Stream a (possibly huge) cohort CSV into a cohort store without loading it"""
+    import pandas as pd
+
+    store = CohortStore.write(store_path, pd.read_csv(csv_path, chunksize=chunk_size))
+    print(f"✅ Converted {store.n_rows} rows from '{csv_path}' to cohort store '{store_path}'")
+    return store
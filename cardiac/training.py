@@ -0,0 +1,233 @@
+"""Cross-validated model selection and training"""
+
+import time
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+
+from .compiled import _timed
+
+# Candidate estimators and the small hyperparameter grid searched for each
+MODEL_CANDIDATES = {
+    'Random Forest': (
+        RandomForestClassifier(random_state=42),
+        {'n_estimators': [50, 100, 200], 'max_depth': [None, 12]}
+    ),
+    'Logistic Regression': (
+        LogisticRegression(random_state=42, max_iter=1000),
+        {'C': [0.1, 1.0, 10.0]}
+    )
+}
+
+def _evaluate_candidate_fold(name, estimator, params, X, y, train_idx, test_idx):
+    """Fit one candidate on one fold and time both fitting and prediction"""
+    model = clone(estimator).set_params(**params)
+    started = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    y_pred = model.predict(X[test_idx])
+    batch_seconds = time.perf_counter() - started
+
+    single_row = X[test_idx[:1]]
+    single_seconds = min(_timed(model.predict, single_row) for _ in range(5))
+    return {
+        'name': name,
+        'params': params,
+        'accuracy': accuracy_score(y[test_idx], y_pred),
+        'fit_seconds': fit_seconds,
+        'predict_us_per_row': batch_seconds / len(test_idx) * 1e6,
+        'single_row_ms': single_seconds * 1000
+    }
+
+def select_cardiac_model(X, y, cv=5, n_jobs=-1, candidates=None):
+    """
+    Cross-validate every candidate/parameter combination, running all
+    (candidate, fold) fits in parallel worker processes. Returns one summary
+    per combination with mean accuracy and fit/predict timings.
+    """
+    candidates = candidates or MODEL_CANDIDATES
+    X = np.asarray(X)
+    y = np.asarray(y)
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=42).split(X, y))
+    jobs = [
+        (name, estimator, params)
+        for name, (estimator, grid) in candidates.items()
+        for params in ParameterGrid(grid)
+    ]
+    fold_results = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_evaluate_candidate_fold)(name, estimator, params, X, y, train_idx, test_idx)
+        for name, estimator, params in jobs
+        for train_idx, test_idx in folds
+    )
+
+    summaries = []
+    for i, (name, estimator, params) in enumerate(jobs):
+        results = fold_results[i * cv:(i + 1) * cv]
+        accuracies = [result['accuracy'] for result in results]
+        summaries.append({
+            'name': name,
+            'params': params,
+            'estimator': estimator,
+            'accuracy': float(np.mean(accuracies)),
+            'accuracy_std': float(np.std(accuracies)),
+            'fit_seconds': float(np.mean([result['fit_seconds'] for result in results])),
+            'predict_us_per_row': float(np.mean([result['predict_us_per_row'] for result in results])),
+            'single_row_ms': float(np.median([result['single_row_ms'] for result in results]))
+        })
+    return summaries
+
+def _choose_candidate(summaries, accuracy_tolerance=0.0, max_latency_ms=None):
+    """
+    Pick the most accurate candidate, or, within `accuracy_tolerance` of it,
+    the one with the lowest single-row latency. Candidates slower than
+    `max_latency_ms` are only considered if nothing meets the budget.
+    """
+    eligible = summaries
+    if max_latency_ms is not None:
+        eligible = [s for s in summaries if s['single_row_ms'] <= max_latency_ms] or summaries
+    best_accuracy = max(s['accuracy'] for s in eligible)
+    close_enough = [s for s in eligible if s['accuracy'] >= best_accuracy - accuracy_tolerance]
+    if accuracy_tolerance > 0:
+        return min(close_enough, key=lambda s: s['single_row_ms'])
+    return max(close_enough, key=lambda s: (s['accuracy'], -s['single_row_ms']))
+
+def _format_params(params):
+    return ', '.join(f"{key}={value}" for key, value in sorted(params.items()))
+
+def train_cardiac_models(X, y, cv=5, n_jobs=-1, accuracy_tolerance=0.0, max_latency_ms=None):
+    print("🤖 Training cardiac arrest prediction models...")
+    X = np.asarray(X)
+    y = np.asarray(y)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    print(f"\n🔄 Cross-validating {sum(len(ParameterGrid(grid)) for _, grid in MODEL_CANDIDATES.values())} "
+          f"candidates ({cv}-fold, all cores)...")
+    summaries = select_cardiac_model(X_train, y_train, cv=cv, n_jobs=n_jobs)
+    for s in sorted(summaries, key=lambda s: -s['accuracy']):
+        print(f"✅ {s['name']} ({_format_params(s['params'])}): "
+              f"CV Accuracy: {s['accuracy']:.3f} ± {s['accuracy_std']:.3f} | "
+              f"fit {s['fit_seconds']:.2f}s | predict {s['predict_us_per_row']:.1f} µs/row | "
+              f"single row {s['single_row_ms']:.2f} ms")
+
+    chosen = _choose_candidate(summaries, accuracy_tolerance, max_latency_ms)
+    best_model = clone(chosen['estimator']).set_params(**chosen['params'])
+    best_model.fit(X_train, y_train)
+    best_score = accuracy_score(y_test, best_model.predict(X_test))
+    best_model_name = chosen['name']
+        
+    print(f"\n🏆 Best model: {best_model_name} ({_format_params(chosen['params'])}) "
+          f"(Test Accuracy: {best_score:.3f})")
+    return best_model, best_model_name
+
+# Out-of-core training reads the store in blocks of up to this many
+# consecutive rows; every chunk is a random set of blocks, so exports ordered
+# by phase, patient or time still give each chunk a mix of the whole cohort
+SHUFFLE_BLOCK_ROWS = 1024
+# Blocks per chunk; with this many, a chunk of a phase-sorted export misses a
+# phase of 10% prevalence with probability ~1e-12
+MIN_BLOCKS_PER_CHUNK = 256
+
+def _block_rows(blocks, n_rows, block_rows):
+    """Sorted row indices covered by the given block ids"""
+    rows = (np.sort(blocks)[:, None] * block_rows + np.arange(block_rows)).ravel()
+    return rows[rows < n_rows]
+
+def _shuffled_chunks(blocks, n_chunks, rng):
+    """Endless stream of random, equally sized chunks of block ids, each block once per pass"""
+    while True:
+        yield from np.array_split(rng.permutation(blocks), n_chunks)
+
+def _phases_present(store, chunk_size):
+    counts = np.zeros(len(store.header['categories']['physiological_phase']), dtype=np.int64)
+    codes = store.column('physiological_phase')
+    for begin in range(0, len(store), chunk_size):
+        counts += np.bincount(codes[begin:begin + chunk_size], minlength=len(counts))
+    return np.unique(store._to_model_codes(np.flatnonzero(counts)))
+
+def train_cardiac_model_out_of_core(store, estimator='forest', chunk_size=200_000, holdout_rows=20_000,
+                                    trees_per_chunk=10, max_trees=200, max_depth=12, epochs=1,
+                                    registry=None, seed=42):
+    """
+    Train on a CohortStore that may be much larger than memory. The imputer
+    and scaler statistics are fitted in a streaming pass (they use no labels,
+    so the holdout rows are included), then the model sees one chunk at a
+    time. Chunks are random sets of small row blocks, so the row order of
+    the export does not matter:
+
+    - 'forest': a warm-started RandomForest that grows `trees_per_chunk`
+      new trees per chunk, at most `max_trees` in total; when the cohort has
+      more chunks than that, each round of trees sees a random chunk
+    - 'sgd': the online SGD logistic regression, `epochs` passes over
+      shuffled chunks
+
+    About `holdout_rows` rows in random blocks are held out for the reported
+    accuracy. Peak memory is a few chunks regardless of the store size.
+    Returns (model, model_name, preprocessor).
+    """
+    from .online import ONLINE_MODEL_NAME, OnlineCardiacLearner
+    from .preprocessing import CardiacDataPreprocessor
+
+    rng = np.random.default_rng(seed)
+    n_rows = len(store)
+    # Small chunks and small stores get smaller blocks, so chunks still mix many of them
+    block_rows = max(1, min(SHUFFLE_BLOCK_ROWS, chunk_size // MIN_BLOCKS_PER_CHUNK, n_rows // 100))
+    blocks = rng.permutation(-(-n_rows // block_rows))
+    n_holdout_blocks = -(-min(holdout_rows, n_rows // 5) // block_rows)
+    holdout_blocks, train_blocks = blocks[:n_holdout_blocks], blocks[n_holdout_blocks:]
+    train_rows = int(n_rows - len(_block_rows(holdout_blocks, n_rows, block_rows)))
+    blocks_per_chunk = max(1, chunk_size // block_rows)
+    n_chunks = max(1, round(len(train_blocks) / blocks_per_chunk))
+
+    preprocessor = CardiacDataPreprocessor().fit_store(store, chunk_size=chunk_size)
+    names = preprocessor.feature_names
+    chunks = _shuffled_chunks(train_blocks, n_chunks, rng)
+
+    if estimator == 'forest':
+        classes = _phases_present(store, chunk_size)
+        rounds = min(n_chunks, max(1, max_trees // trees_per_chunk))
+        print(f"🤖 Training out of core on {train_rows} rows: {rounds * trees_per_chunk} trees "
+              f"over {rounds} of {n_chunks} shuffled chunks of ~{chunk_size}...")
+        model = RandomForestClassifier(n_estimators=0, warm_start=True, max_depth=max_depth,
+                                       random_state=seed, n_jobs=-1)
+        for _ in range(rounds):
+            X, y = store.take_rows(names, _block_rows(next(chunks), n_rows, block_rows))
+            # Warm-started trees must all be fitted on the same classes
+            missing = np.setdiff1d(classes, y)
+            if len(missing):
+                raise ValueError(f"A training chunk has no rows of phase code(s) {missing.tolist()}; "
+                                 f"increase chunk_size")
+            model.n_estimators += trees_per_chunk
+            model.fit(preprocessor.transform(X).astype(np.float32), y)
+        model_name = 'Random Forest'
+    elif estimator == 'sgd':
+        print(f"🤖 Training out of core on {train_rows} rows in {n_chunks} shuffled chunks of ~{chunk_size}...")
+        learner = OnlineCardiacLearner(preprocessor=preprocessor, checkpoint_every=0, random_state=seed)
+        for _ in range(epochs * n_chunks):
+            X, y = store.take_rows(names, _block_rows(next(chunks), n_rows, block_rows))
+            order = rng.permutation(len(y))
+            learner.partial_fit(X[order], y[order])
+        learner.close()
+        model, model_name = learner.model, ONLINE_MODEL_NAME
+    else:
+        raise ValueError(f"Unknown out-of-core estimator: {estimator}")
+
+    metrics = {'rows_trained': train_rows}
+    if len(holdout_blocks):
+        correct = total = 0
+        for begin in range(0, len(holdout_blocks), blocks_per_chunk):
+            X, y = store.take_rows(names, _block_rows(holdout_blocks[begin:begin + blocks_per_chunk], n_rows, block_rows))
+            correct += int(np.sum(model.predict(preprocessor.transform(X)) == y))
+            total += len(y)
+        metrics['holdout_accuracy'] = correct / total
+        print(f"🏆 {model_name}: holdout accuracy {metrics['holdout_accuracy']:.3f} on {total} rows")
+    if registry is not None:
+        registry.save(model, model_name, preprocessor, metrics=metrics)
+    return model, model_name, preprocessor
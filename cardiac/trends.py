@@ -0,0 +1,156 @@
+"""Constant-time rolling trends over a patient's recent vital signs"""
+
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+from .schema import TREND_VITALS
+
+class VitalsTrendBuffer:
+    """
+    Fixed-capacity ring buffer of one patient's readings, one column per vital.
+    Appending a reading updates windowed mean/variance (Welford with removal)
+    and monotonic min/max queues, so trends, variability and the compensatory
+    index are available in constant time per reading. Memory is fixed by
+    `capacity`, which defaults to one 36-hour cycle of 15-minute readings.
+    """
+    def __init__(self, capacity=144, window=24, readings_per_hour=4):
+        if capacity < window:
+            raise ValueError("capacity must be at least the statistics window")
+        self.capacity = capacity
+        self.window = window
+        self.lag_1h = readings_per_hour
+        self.lag_6h = 6 * readings_per_hour
+        if capacity <= self.lag_6h:
+            raise ValueError("capacity must hold more than six hours of readings")
+        self._columns = {vital: i for i, vital in enumerate(TREND_VITALS)}
+        self._values = np.full((capacity, len(TREND_VITALS)), np.nan)
+        self._timestamps = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[ms]')
+        self.reset()
+
+    def reset(self):
+        self.n_readings = 0
+        self._values.fill(np.nan)
+        self._timestamps.fill(np.datetime64('NaT'))
+        self._mean = np.zeros(len(TREND_VITALS))
+        self._m2 = np.zeros(len(TREND_VITALS))
+        self._min_queues = [deque() for _ in TREND_VITALS]
+        self._max_queues = [deque() for _ in TREND_VITALS]
+
+    def __len__(self):
+        return min(self.n_readings, self.capacity)
+
+    def append(self, vitals, timestamp=None):
+        """Add one reading (a dict holding at least TREND_VITALS)"""
+        row = np.array([vitals[vital] for vital in TREND_VITALS], dtype=float)
+        count = self.n_readings
+
+        # Slide the statistics window: drop the reading that falls out of it
+        in_window = min(count, self.window)
+        if count >= self.window:
+            old = self._values[(count - self.window) % self.capacity]
+            in_window -= 1
+            if in_window == 0:
+                self._mean[:] = 0
+                self._m2[:] = 0
+            else:
+                delta = old - self._mean
+                self._mean -= delta / in_window
+                self._m2 -= delta * (old - self._mean)
+        in_window += 1
+        delta = row - self._mean
+        self._mean += delta / in_window
+        self._m2 += delta * (row - self._mean)
+
+        oldest_in_window = count - self.window + 1
+        for i, value in enumerate(row):
+            min_queue, max_queue = self._min_queues[i], self._max_queues[i]
+            while min_queue and min_queue[-1][1] >= value:
+                min_queue.pop()
+            while max_queue and max_queue[-1][1] <= value:
+                max_queue.pop()
+            min_queue.append((count, value))
+            max_queue.append((count, value))
+            if min_queue[0][0] < oldest_in_window:
+                min_queue.popleft()
+            if max_queue[0][0] < oldest_in_window:
+                max_queue.popleft()
+
+        position = count % self.capacity
+        self._values[position] = row
+        if timestamp is None:
+            timestamp = vitals.get('timestamp', datetime.now())
+        self._timestamps[position] = np.datetime64(timestamp, 'ms')
+        self.n_readings = count + 1
+
+    def _lagged(self, vital, lag):
+        """Return the reading `lag` steps before the latest one, or None"""
+        if self.n_readings <= lag:
+            return None
+        return self._values[(self.n_readings - 1 - lag) % self.capacity, self._columns[vital]]
+
+    def latest(self, vital):
+        return self._lagged(vital, 0)
+
+    def trend(self, vital, hours):
+        """Change of a vital over the last `hours` (0 until enough history exists)"""
+        lag = self.lag_1h if hours == 1 else self.lag_6h
+        past = self._lagged(vital, lag)
+        return 0.0 if past is None else float(self.latest(vital) - past)
+
+    def stats(self, vital):
+        """Mean, variance, min and max of a vital over the statistics window"""
+        i = self._columns[vital]
+        n = min(self.n_readings, self.window)
+        if n == 0:
+            return {'mean': np.nan, 'variance': np.nan, 'min': np.nan, 'max': np.nan}
+        return {
+            'mean': float(self._mean[i]),
+            'variance': float(max(self._m2[i], 0.0) / n),
+            'min': float(self._min_queues[i][0][1]),
+            'max': float(self._max_queues[i][0][1])
+        }
+
+    def variability(self, vital):
+        return float(np.sqrt(self.stats(vital)['variance'])) if self.n_readings > 1 else 0.0
+
+    def compensatory_index(self):
+        """
+        0-1 score of how hard the body is compensating: half from the shock
+        index (HR / systolic BP, 0.5 is normal, 1.0 is shock) and a quarter
+        each from the 6-hour heart-rate and respiratory-rate rises.
+        """
+        if self.n_readings == 0:
+            return 0.0
+        shock_index = self.latest('heart_rate') / max(self.latest('systolic_bp'), 1.0)
+        index = (0.5 * np.clip((shock_index - 0.5) / 0.5, 0, 1)
+                 + 0.25 * np.clip(self.trend('heart_rate', 6) / 20, 0, 1)
+                 + 0.25 * np.clip(self.trend('respiratory_rate', 6) / 8, 0, 1))
+        return float(index)
+
+    def trend_features(self):
+        """The trend, variability and compensatory-index model features"""
+        return {
+            'hr_trend_1h': self.trend('heart_rate', 1),
+            'hr_trend_6h': self.trend('heart_rate', 6),
+            'rr_trend_1h': self.trend('respiratory_rate', 1),
+            'rr_trend_6h': self.trend('respiratory_rate', 6),
+            'bp_trend_1h': self.trend('systolic_bp', 1),
+            'bp_trend_6h': self.trend('systolic_bp', 6),
+            'spo2_trend_1h': self.trend('oxygen_saturation', 1),
+            'spo2_trend_6h': self.trend('oxygen_saturation', 6),
+            'hr_variability': self.variability('heart_rate'),
+            'bp_variability': self.variability('systolic_bp'),
+            'compensatory_index': self.compensatory_index()
+        }
+
+    def to_frame(self):
+        """Stored history in chronological order (for plotting, not the hot path)"""
+        import pandas as pd
+
+        n = len(self)
+        order = (np.arange(self.n_readings - n, self.n_readings)) % self.capacity
+        history = pd.DataFrame(self._values[order], columns=TREND_VITALS)
+        history.insert(0, 'timestamp', self._timestamps[order])
+        return history
@@ -0,0 +1,54 @@
+"""Trend plots; matplotlib and seaborn are only imported with this module"""
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from .downsampling import downsample_series
+
+plt.style.use('default')
+sns.set_palette("husl")
+
+def plot_trends(data_df, max_points=500):
+    """
+    Generates a trend graph from the collected data. Long histories are
+    downsampled to `max_points` per series; this blocks on plt.show(), so the
+    monitoring loop uses TrendRenderer instead.
+    """
+    if data_df.empty: return
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig.suptitle('Real-time Patient Vitals Trends', fontsize=16)
+
+    timestamps = pd.to_datetime(data_df['timestamp']).to_numpy()
+
+    def series(column):
+        return downsample_series(timestamps, data_df[column].to_numpy(dtype=float), max_points)
+    
+    axes[0, 0].plot(*series('heart_rate'), 'r-o', label='Heart Rate (bpm)')
+    axes[0, 0].set_title('Heart Rate Trend')
+    axes[0, 0].set_ylabel('BPM')
+    axes[0, 0].grid(True)
+    axes[0, 0].tick_params(axis='x', rotation=45)
+
+    axes[0, 1].plot(*series('respiratory_rate'), 'b-o', label='Respiratory Rate (/min)')
+    axes[0, 1].set_title('Respiratory Rate Trend')
+    axes[0, 1].set_ylabel('Breaths/min')
+    axes[0, 1].grid(True)
+    axes[0, 1].tick_params(axis='x', rotation=45)
+
+    axes[1, 0].plot(*series('systolic_bp'), 'g-o', label='Systolic BP (mmHg)')
+    axes[1, 0].plot(*series('diastolic_bp'), 'g--o', label='Diastolic BP (mmHg)')
+    axes[1, 0].set_title('Blood Pressure Trend')
+    axes[1, 0].set_ylabel('mmHg')
+    axes[1, 0].grid(True)
+    axes[1, 0].tick_params(axis='x', rotation=45)
+    axes[1, 0].legend()
+
+    axes[1, 1].plot(*series('oxygen_saturation'), 'm-o', label='SpO2 (%)')
+    axes[1, 1].set_title('Oxygen Saturation Trend')
+    axes[1, 1].set_ylabel('Percentage')
+    axes[1, 1].grid(True)
+    axes[1, 1].tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+    plt.show()
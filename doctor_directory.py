@@ -0,0 +1,243 @@
+"""
+Per-process cache of the public doctor directory (GET /api/medical/doctors).
+
+The serialized payload, its gzip encoding, ETag and Last-Modified are built
+once per directory version and reused, so a directory read between edits
+costs one primary-key lookup of the shared version row, or a 304 when the
+client's copy is still current. Doctor writes bump that row (CacheVersion)
+in their own transaction, so every worker rebuilds on its next read after a
+commit, whichever worker handled the write. Last-Modified is the row's
+changed_at, the same in every worker.
+
+Writes that bypass DirectoryCache.touch() (raw SQL, another service) are not
+seen until the next touch.
+
+Doctor search (GET /api/medical/doctors/search) runs against an inverted
+index built from the same snapshot, so it follows the same version.
+"""
+
+import gzip
+import hashlib
+from datetime import datetime, timezone
+
+import numpy as np
+from flask import Response, current_app, request
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, CacheVersion
+
+# Bodies shorter than this are not worth compressing
+MIN_GZIP_BYTES = 1024
+
+# Search parameter -> doctor field; a doctor matches a parameter when the
+# field holds any of the requested values (case-insensitive)
+SEARCH_FILTERS = {
+    'specialty': 'specialty',
+    'language': 'languages',
+    'consultation_type': 'consultationTypes',
+    'available_on': 'availableDates'
+}
+SEARCH_SORT_KEYS = ('rating', 'fees', 'experience', 'name')
+
+# Dialects whose INSERT ... ON CONFLICT DO UPDATE bumps the version row atomically
+UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+class SearchError(ValueError):
+    """Invalid doctor search parameter"""
+
+def serialize_doctor(doc):
+    return {
+        'id': doc.id,
+        'name': doc.name,
+        'specialty': doc.specialty,
+        'imageUrl': doc.imageUrl,
+        'availableDates': doc.availableDates,
+        'qualifications': doc.qualifications,
+        'experience': doc.experience,
+        'languages': doc.languages,
+        'bio': doc.bio,
+        'rating': doc.rating,
+        'email': doc.email,
+        'phone': doc.phone,
+        'consultationTypes': doc.consultationTypes,
+        'fees': doc.fees,
+        'isActive': doc.isActive
+    }
+
+class DirectoryEntry:
+    """One serialized directory: identity and gzip bodies with their validators"""
+    def __init__(self, doctors, body, last_modified, version=0):
+        self.doctors = doctors
+        self.version = version
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= MIN_GZIP_BYTES else None
+        digest = hashlib.sha1(body).hexdigest()
+        self.etag = digest
+        self.gzip_etag = f"{digest}-gzip"
+        self.last_modified = last_modified
+        self._search_index = None
+
+    @property
+    def search_index(self):
+        """DoctorSearchIndex over this snapshot, built on first use"""
+        if self._search_index is None:
+            self._search_index = DoctorSearchIndex(self.doctors)
+        return self._search_index
+
+class DoctorSearchIndex:
+    """
+    Inverted index over a directory snapshot. Each filter value maps to the
+    sorted positions of the doctors carrying it, fees are kept in sorted
+    order for range lookups, and every sort key has a precomputed ranking,
+    so a search costs time proportional to the postings it touches and the
+    matches it ranks rather than to the size of the directory.
+    """
+    def __init__(self, doctors):
+        self.doctors = doctors
+        postings = {param: {} for param in SEARCH_FILTERS}
+        for position, doc in enumerate(doctors):
+            for param, field in SEARCH_FILTERS.items():
+                values = doc.get(field) or []
+                for value in ([values] if isinstance(values, str) else values):
+                    postings[param].setdefault(_search_key(value), []).append(position)
+        self._postings = {param: {value: np.asarray(positions, dtype=np.int64) for value, positions in index.items()}
+                          for param, index in postings.items()}
+
+        ids = np.array([doc['id'] for doc in doctors], dtype=np.int64)
+        fees = np.array([np.nan if doc.get('fees') is None else doc['fees'] for doc in doctors], dtype=float)
+        priced = np.flatnonzero(~np.isnan(fees))
+        self._fee_order = priced[np.lexsort((ids[priced], fees[priced]))]
+        self._sorted_fees = fees[self._fee_order]
+
+        # Ranking per (key, descending); doctors without a value sort last either way
+        self._order, self._rank = {}, {}
+        for key in SEARCH_SORT_KEYS:
+            if key == 'name':
+                names = np.array([(doc.get('name') or '').lower() for doc in doctors], dtype=object)
+                ascending = np.lexsort((ids, names.astype(str))) if len(doctors) else np.zeros(0, dtype=np.int64)
+                orders = {False: ascending, True: ascending[::-1]}
+            else:
+                values = np.array([np.nan if doc.get(key) is None else doc[key] for doc in doctors], dtype=float)
+                orders = {False: np.lexsort((ids, np.where(np.isnan(values), np.inf, values))),
+                          True: np.lexsort((ids, np.where(np.isnan(values), np.inf, -values)))}
+            for descending, order in orders.items():
+                rank = np.empty(len(order), dtype=np.int64)
+                rank[order] = np.arange(len(order))
+                self._order[key, descending] = order
+                self._rank[key, descending] = rank
+
+    def search(self, filters=None, min_fee=None, max_fee=None, sort='rating', descending=True, offset=0, limit=20):
+        """
+        (total, doctors) for one page of the matches. `filters` maps
+        SEARCH_FILTERS parameters to lists of accepted values; parameters
+        combine with AND, values within one with OR.
+        """
+        if sort not in SEARCH_SORT_KEYS:
+            raise SearchError(f"sort must be one of: {', '.join(SEARCH_SORT_KEYS)}")
+        matches = None
+        for param, values in (filters or {}).items():
+            index = self._postings[param]
+            hits = [index[_search_key(value)] for value in values if _search_key(value) in index]
+            positions = np.unique(np.concatenate(hits)) if hits else np.zeros(0, dtype=np.int64)
+            matches = positions if matches is None else np.intersect1d(matches, positions, assume_unique=True)
+        if min_fee is not None or max_fee is not None:
+            lo = 0 if min_fee is None else np.searchsorted(self._sorted_fees, min_fee, side='left')
+            hi = len(self._sorted_fees) if max_fee is None else np.searchsorted(self._sorted_fees, max_fee, side='right')
+            positions = np.sort(self._fee_order[lo:hi])
+            matches = positions if matches is None else np.intersect1d(matches, positions, assume_unique=True)
+
+        if matches is None:
+            page = self._order[sort, descending][offset:offset + limit]
+            total = len(self.doctors)
+        else:
+            ranked = matches[np.argsort(self._rank[sort, descending][matches], kind='stable')]
+            page = ranked[offset:offset + limit]
+            total = len(matches)
+        return total, [self.doctors[position] for position in page]
+
+def _search_key(value):
+    return str(value).strip().lower()
+
+class DirectoryCache:
+    """
+    Cache of `build()` (a JSON-serializable payload) keyed by the shared
+    CacheVersion row `name`. Writers call touch() before committing; every
+    read compares the row with the cached entry and rebuilds when it moved.
+    """
+    def __init__(self, build, name):
+        self._build = build
+        self.name = name
+        self._entry = None
+        self.hits = 0
+        self.misses = 0
+
+    def shared_version(self):
+        """(version, changed_at) of the shared row; (0, None) before the first write"""
+        row = db.session.execute(
+            select(CacheVersion.version, CacheVersion.changed_at).where(CacheVersion.name == self.name)).first()
+        if row is None:
+            return 0, None
+        return row.version, row.changed_at.replace(tzinfo=timezone.utc, microsecond=0)
+
+    def get(self):
+        # The version is read before building, so a write racing the build
+        # leaves the entry labelled older than its content, never newer
+        version, changed_at = self.shared_version()
+        entry = self._entry
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        doctors = self._build()
+        entry = DirectoryEntry(doctors, current_app.json.dumps(doctors).encode('utf-8') + b'\n', changed_at, version)
+        self._entry = entry
+        return entry
+
+    def touch(self):
+        """
+        Bump the shared version in the current transaction; call before
+        db.session.commit(). On SQLite and PostgreSQL this is a single upsert,
+        so concurrent first writes cannot collide on the row's primary key;
+        elsewhere the row must already exist (migration 2 seeds it).
+        """
+        now = datetime.utcnow()
+        dialect_name = db.session.get_bind().dialect.name
+        if dialect_name not in UPSERT_DIALECTS:
+            db.session.execute(update(CacheVersion).where(CacheVersion.name == self.name)
+                               .values(version=CacheVersion.version + 1, changed_at=now))
+            return
+        upsert = UPSERT_DIALECTS[dialect_name](CacheVersion).values(name=self.name, version=1, changed_at=now)
+        db.session.execute(upsert.on_conflict_do_update(
+            index_elements=[CacheVersion.name],
+            set_={'version': CacheVersion.version + 1, 'changed_at': now}))
+
+    def response(self):
+        """
+        The cached directory for the current request: 304 when If-None-Match
+        (or, without it, If-Modified-Since) matches, otherwise the gzip body
+        when the client accepts it and the identity body when not.
+        """
+        entry = self.get()
+        use_gzip = entry.gzip_body is not None and 'gzip' in request.accept_encodings
+        etag = entry.gzip_etag if use_gzip else entry.etag
+
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(etag)
+        elif request.if_modified_since and entry.last_modified is not None:
+            not_modified = entry.last_modified <= request.if_modified_since
+        else:
+            not_modified = False
+
+        response = Response(status=304) if not_modified else Response(
+            entry.gzip_body if use_gzip else entry.body, mimetype='application/json')
+        if use_gzip and not not_modified:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(etag)
+        # Before the first doctor write there is no shared timestamp to send;
+        # Werkzeug would otherwise stamp the current time
+        if entry.last_modified is not None:
+            response.last_modified = entry.last_modified
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        return response
@@ -0,0 +1,93 @@
+"""
+Time-bucketed aggregation of health metrics for trend charts
+(GET /api/medical/metrics?type=...&bucket=1m|1h|1d).
+
+Buckets are computed by the database in one GROUP BY over the patient's
+readings of one metric type in the requested range, so a chart receives one
+min/max/avg/count/last row per bucket instead of every raw reading. A
+request spanning more than MAX_BUCKETS buckets is refused rather than
+serialized.
+"""
+
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func, select
+
+from cardiac.downsampling import lttb
+
+# bucket -> (SQLite strftime format, PostgreSQL date_trunc unit, width)
+BUCKETS = {
+    '1m': ('%Y-%m-%dT%H:%M:00', 'minute', timedelta(minutes=1)),
+    '1h': ('%Y-%m-%dT%H:00:00', 'hour', timedelta(hours=1)),
+    '1d': ('%Y-%m-%dT00:00:00', 'day', timedelta(days=1))
+}
+MAX_POINTS = 10_000
+MAX_BUCKETS = 10_000
+
+class AggregationError(ValueError):
+    """Invalid bucket, type or points parameter"""
+
+def bucket_expression(column, bucket, dialect_name):
+    """SQL expression truncating `column` to the start of its bucket"""
+    if bucket not in BUCKETS:
+        raise AggregationError(f"bucket must be one of: {', '.join(BUCKETS)}")
+    sqlite_format, unit, _ = BUCKETS[bucket]
+    if dialect_name == 'sqlite':
+        return func.strftime(sqlite_format, column)
+    return func.date_trunc(unit, column)
+
+def aggregate_metrics(session, model, patient_id, metric_type, bucket, since=None, until=None,
+                      max_buckets=MAX_BUCKETS):
+    """
+    [{bucket, min, max, avg, count, last}] in bucket order for one patient
+    and metric type; `since` is inclusive and `until` exclusive. `last` is
+    the value of the newest reading in the bucket. Raises AggregationError
+    when the range spans, or the readings fill, more than `max_buckets`.
+    """
+    bucket_start = bucket_expression(model.date, bucket, session.get_bind().dialect.name).label('bucket')
+    # Refuse an oversized range before running it; open ranges are bounded by the LIMIT below
+    if since is not None and until is not None and math.ceil((until - since) / BUCKETS[bucket][2]) > max_buckets:
+        raise AggregationError(f'since/until span more than {max_buckets} {bucket} buckets')
+    readings = select(
+        bucket_start,
+        model.value,
+        func.row_number().over(partition_by=bucket_start, order_by=(model.date.desc(), model.id.desc())).label('recency')
+    ).where(model.patient_id == patient_id, model.metric_type == metric_type)
+    if since is not None:
+        readings = readings.where(model.date >= since)
+    if until is not None:
+        readings = readings.where(model.date < until)
+    readings = readings.subquery()
+
+    statement = select(
+        readings.c.bucket,
+        func.min(readings.c.value),
+        func.max(readings.c.value),
+        func.avg(readings.c.value),
+        func.count(),
+        func.max(readings.c.value).filter(readings.c.recency == 1)
+    ).group_by(readings.c.bucket).order_by(readings.c.bucket).limit(max_buckets + 1)
+
+    rows = session.execute(statement).all()
+    if len(rows) > max_buckets:
+        raise AggregationError(f'More than {max_buckets} buckets; narrow since/until or use a wider bucket')
+    return [{
+        'bucket': start.isoformat() if isinstance(start, datetime) else start,
+        'min': minimum,
+        'max': maximum,
+        'avg': float(average),
+        'count': count,
+        'last': last
+    } for start, minimum, maximum, average, count, last in rows]
+
+def downsample_buckets(buckets, points):
+    """At most `points` of the buckets, chosen by LTTB on their averages"""
+    if not 3 <= points <= MAX_POINTS:
+        raise AggregationError(f'points must be between 3 and {MAX_POINTS}')
+    if len(buckets) <= points:
+        return buckets
+    times = np.array([row['bucket'] for row in buckets], dtype='datetime64[s]').astype(np.int64)
+    keep = lttb(times, [row['avg'] for row in buckets], points)
+    return [buckets[i] for i in keep]
@@ -0,0 +1,122 @@
+"""
+Parsing and validation of bulk health-metric uploads (POST
+/api/medical/metrics/bulk): a JSON array or newline-delimited JSON of
+{metric_type, value, unit, date} readings.
+
+Validation is column-wise over the whole batch, and only rejected rows are
+looked at one by one (to word their errors), so checking a day of
+minute-level readings costs a few vectorized passes.
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines')
+MAX_BULK_ROWS = 100_000
+# Column lengths of HealthMetric
+MAX_METRIC_TYPE_LENGTH = 50
+MAX_UNIT_LENGTH = 20
+
+class BulkIngestError(ValueError):
+    """The upload as a whole cannot be read"""
+
+def parse_bulk_body(request):
+    """
+    Readings of the request as a list, in upload order. NDJSON lines that
+    are not valid JSON become None (rejected by validate_metric_rows).
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            raise BulkIngestError('Body must be a JSON array of readings or newline-delimited JSON')
+    if not items:
+        raise BulkIngestError('No readings provided')
+    if len(items) > MAX_BULK_ROWS:
+        raise BulkIngestError(f'At most {MAX_BULK_ROWS} readings per request')
+    return items
+
+def _column(items, is_object, key):
+    return pd.Series([item.get(key) if ok else None for item, ok in zip(items, is_object)], dtype=object)
+
+def _string_ok(column, max_length, required):
+    # Lengths of the strings only: .str refuses a column that holds none
+    lengths = np.array([len(value) if isinstance(value, str) else -1 for value in column], dtype=np.int64)
+    ok = (lengths >= (1 if required else 0)) & (lengths <= max_length)
+    return ok if required else ok | np.array([value is None for value in column], dtype=bool)
+
+def _as_float(value):
+    """A JSON number as a float; NaN for anything else, including integers beyond the float range"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    try:
+        return float(value)
+    except OverflowError:
+        return np.nan
+
+def validate_metric_rows(items, patient_id, now=None):
+    """
+    (rows, errors): insertable HealthMetric dicts for the valid readings and
+    {'index', 'error'} for each rejected one. A missing date defaults to
+    `now`; dates with an offset are stored as naive UTC, like utcnow().
+    """
+    now = now or datetime.utcnow()
+    is_object = np.array([isinstance(item, dict) for item in items])
+
+    metric_types = _column(items, is_object, 'metric_type')
+    type_ok = _string_ok(metric_types, MAX_METRIC_TYPE_LENGTH, required=True)
+
+    raw_values = _column(items, is_object, 'value')
+    values = np.fromiter((_as_float(value) for value in raw_values), dtype=float, count=len(raw_values))
+    value_ok = np.isfinite(values)
+
+    units = _column(items, is_object, 'unit')
+    unit_ok = _string_ok(units, MAX_UNIT_LENGTH, required=False)
+
+    raw_dates = _column(items, is_object, 'date')
+    date_given = raw_dates.notna().to_numpy()
+    date_strings = raw_dates.where(raw_dates.map(lambda value: isinstance(value, str)))
+    dates = pd.to_datetime(date_strings, errors='coerce', utc=True, format='ISO8601').dt.tz_convert(None)
+    date_ok = ~date_given | dates.notna().to_numpy()
+
+    valid = is_object & type_ok & value_ok & unit_ok & date_ok
+    errors = []
+    for index in np.flatnonzero(~valid).tolist():
+        if not is_object[index]:
+            reason = 'Reading must be a JSON object'
+        else:
+            problems = []
+            if not type_ok[index]:
+                problems.append(f'metric_type must be a non-empty string of at most {MAX_METRIC_TYPE_LENGTH} characters')
+            if not value_ok[index]:
+                problems.append('value must be a finite number')
+            if not unit_ok[index]:
+                problems.append(f'unit must be a string of at most {MAX_UNIT_LENGTH} characters')
+            if not date_ok[index]:
+                problems.append('date must be an ISO 8601 datetime')
+            reason = '; '.join(problems)
+        errors.append({'index': index, 'error': reason})
+
+    kept = np.flatnonzero(valid)
+    parsed = dates.iloc[kept].to_numpy(dtype='datetime64[us]').tolist()
+    row_dates = [date if given else now for date, given in zip(parsed, date_given[kept].tolist())]
+    rows = [{
+        'patient_id': patient_id,
+        'metric_type': metric_type,
+        'value': value,
+        'unit': unit,
+        'date': date
+    } for metric_type, value, unit, date in zip(metric_types.iloc[kept].tolist(), values[kept].tolist(),
+                                                units.iloc[kept].tolist(), row_dates)]
+    return rows, errors
@@ -0,0 +1,211 @@
+"""
+Versioned schema migrations for databases created before a schema change.
+
+db.create_all() only creates missing tables, so an index declared on a model
+never reaches an existing database. Each migration here is a numbered list of
+idempotent statements; upgrade() applies the ones a database has not seen yet
+and records them in the schema_migrations table. New migrations are appended
+with the next version number and never edited once released.
+
+    python migrations.py [database_url] [--check]
+
+--check also requests the hot routes (HOT_ROUTES) through a test client, runs
+EXPLAIN QUERY PLAN on every statement they issue, and fails (exit status 1)
+when one of them scans a table or sorts outside an index. The plan check reads
+SQLite plans only; on other databases it is reported as skipped and the exit
+status is PLAN_CHECK_SKIPPED (2), after the migrations have been applied.
+"""
+
+import sys
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+
+from pagination import encode_cursor
+
+DEFAULT_DATABASE_URL = 'sqlite:///instance/healthcare.db'
+# Dialects whose query plans check_query_plans() can read
+PLAN_CHECK_DIALECTS = ('sqlite',)
+PLAN_CHECK_SKIPPED = 2
+
+MIGRATIONS = [
+    (1, 'Composite indexes for the per-patient listings and doctor schedules', [
+        'CREATE INDEX IF NOT EXISTS ix_medical_record_patient_date ON medical_record (patient_id, date)',
+        'CREATE INDEX IF NOT EXISTS ix_appointment_patient_date ON appointment (patient_id, date)',
+        'CREATE INDEX IF NOT EXISTS ix_appointment_doctor_date ON appointment (doctor_id, date)',
+        'CREATE INDEX IF NOT EXISTS ix_prescription_patient_start_date ON prescription (patient_id, start_date)',
+        'CREATE INDEX IF NOT EXISTS ix_health_metric_patient_date ON health_metric (patient_id, date)',
+        'CREATE INDEX IF NOT EXISTS ix_health_metric_patient_type_date ON health_metric (patient_id, metric_type, date)'
+    ]),
+    (2, 'Shared version row of the doctor directory cache', [
+        'CREATE TABLE IF NOT EXISTS cache_version ('
+        'name VARCHAR(50) NOT NULL PRIMARY KEY, version INTEGER NOT NULL, changed_at TIMESTAMP NOT NULL)',
+        "INSERT INTO cache_version (name, version, changed_at) SELECT 'doctors', 0, CURRENT_TIMESTAMP "
+        "WHERE NOT EXISTS (SELECT 1 FROM cache_version WHERE name = 'doctors')"
+    ])
+]
+
+# Hot routes of the medical blueprint as (name, method, path, JSON body).
+# check_query_plans() requests each one through a test client and explains
+# every statement it issues; the "next page" entries resume after a fixed
+# keyset position, and the appointment POST names a missing doctor so it
+# stops after the doctor lookup without writing.
+HOT_ROUTES = [
+    ('medical records', 'GET', '/api/medical/records', None),
+    ('medical records (next page)', 'GET',
+     f'/api/medical/records?cursor={encode_cursor(datetime(2024, 1, 1), 1)}', None),
+    ('appointments', 'GET', '/api/medical/appointments', None),
+    ('appointments (next page)', 'GET',
+     f'/api/medical/appointments?cursor={encode_cursor(date(2024, 1, 1), 1)}', None),
+    ('prescriptions', 'GET', '/api/medical/prescriptions', None),
+    ('health metrics', 'GET', '/api/medical/metrics', None),
+    ('health metrics by type', 'GET', '/api/medical/metrics?type=heart_rate', None),
+    ('health metric buckets', 'GET',
+     '/api/medical/metrics?type=heart_rate&bucket=1h&since=2024-01-01&until=2024-04-01', None),
+    ('appointment doctor', 'POST', '/api/medical/appointments', {'doctor_id': 0})
+]
+
+# Routes whose plans may sort in a temporary B-tree. The bucket aggregate
+# groups and windows by a computed bucket expression that no index can
+# order; the sort only covers the readings of the requested range, which
+# ix_health_metric_patient_type_date finds.
+TEMP_SORT_ALLOWED = {'health metric buckets'}
+
+def _ensure_version_table(connection):
+    connection.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+        'version INTEGER PRIMARY KEY, description VARCHAR(200) NOT NULL, applied_at TIMESTAMP NOT NULL)'))
+
+def applied_versions(engine):
+    with engine.begin() as connection:
+        _ensure_version_table(connection)
+        return {row[0] for row in connection.execute(text('SELECT version FROM schema_migrations'))}
+
+def current_version(engine):
+    return max(applied_versions(engine), default=0)
+
+def upgrade(engine, verbose=False):
+    """
+    Apply every pending migration, each in its own transaction, and return
+    the versions applied. Safe to run at every start-up and from several
+    processes: statements are idempotent and a version another process
+    recorded first is skipped.
+    """
+    done = applied_versions(engine)
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            with engine.begin() as connection:
+                for statement in statements:
+                    connection.execute(text(statement))
+                connection.execute(
+                    text('INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)'),
+                    {'v': version, 'd': description, 't': datetime.utcnow()})
+        except IntegrityError:
+            continue
+        applied.append(version)
+        if verbose:
+            print(f"✅ Applied migration {version}: {description}")
+    if applied and engine.dialect.name == 'sqlite':
+        # Refresh planner statistics so the new indexes are costed correctly
+        with engine.begin() as connection:
+            connection.execute(text('ANALYZE'))
+    return applied
+
+def capture_route_statements(app, patient_id=1):
+    """{route name: [(statement, parameters)]} issued by HOT_ROUTES for `patient_id`"""
+    from flask_jwt_extended import create_access_token
+    from models import db
+    from query_counter import capture_queries
+
+    with app.app_context():
+        engine = db.engine
+        headers = {'Authorization': f'Bearer {create_access_token(str(patient_id))}'}
+    client = app.test_client()
+    statements = {}
+    for name, method, path, body in HOT_ROUTES:
+        with capture_queries(engine) as captured:
+            response = client.open(path, method=method, json=body, headers=headers)
+        if response.status_code >= 500:
+            raise RuntimeError(f'{method} {path} failed with {response.status_code}: {response.get_data(as_text=True)}')
+        statements[name] = captured
+    return statements
+
+def _scanned_name(line):
+    # "SCAN medical_record", or "SCAN TABLE medical_record" before SQLite 3.36
+    words = line.split()
+    return words[2] if words[1] == 'TABLE' and len(words) > 2 else words[1]
+
+def check_query_plans(app, patient_id=1):
+    """
+    {route name: (ok, plan lines)} for HOT_ROUTES, explaining the statements
+    the routes actually issue. A plan is ok when every table (not subquery)
+    is reached through an index or primary key and, outside
+    TEMP_SORT_ALLOWED, no temporary B-tree is needed for ORDER BY or GROUP BY.
+    Returns None on a database outside PLAN_CHECK_DIALECTS.
+    """
+    from models import db
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name not in PLAN_CHECK_DIALECTS:
+        return None
+    tables = set(db.metadata.tables)
+    results = {}
+    with engine.connect() as connection:
+        for name, captured in capture_route_statements(app, patient_id).items():
+            plan = [row[-1] for statement, parameters in captured
+                    for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+            # SCAN of a subquery or co-routine (e.g. "SCAN anon_1") reads rows already found
+            full_scan = any(line.startswith('SCAN ') and _scanned_name(line) in tables and ' USING ' not in line
+                            for line in plan)
+            temp_sort = any('TEMP B-TREE' in line for line in plan) and name not in TEMP_SORT_ALLOWED
+            results[name] = (bool(plan) and not full_scan and not temp_sort, plan)
+    return results
+
+def create_check_app(database_url):
+    """A bare app serving the medical blueprint on `database_url`, for check_query_plans()"""
+    import secrets
+
+    from flask import Flask
+    from flask_jwt_extended import JWTManager
+    from models import db
+    from routes.medical import medical
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['JWT_SECRET_KEY'] = secrets.token_hex(32)
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(medical, url_prefix='/api/medical')
+    return app
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    check = '--check' in args
+    urls = [arg for arg in args if arg != '--check']
+    database_url = urls[0] if urls else DEFAULT_DATABASE_URL
+    engine = create_engine(database_url)
+
+    print(f"🔄 Schema version {current_version(engine)}, latest {MIGRATIONS[-1][0]}")
+    if not upgrade(engine, verbose=True):
+        print("✅ Schema is up to date")
+    if not check:
+        return 0
+
+    results = check_query_plans(create_check_app(database_url))
+    if results is None:
+        print(f"⚠️ Query plan check skipped: it reads {', '.join(PLAN_CHECK_DIALECTS)} plans only, "
+              f"and this database is {engine.dialect.name}")
+        return PLAN_CHECK_SKIPPED
+    failed = False
+    for name, (ok, plan) in results.items():
+        print(f"{'✅' if ok else '❌'} {name}: {' | '.join(plan)}")
+        failed |= not ok
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
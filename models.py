@@ -46,6 +46,7 @@ class MedicalRecord(db.Model):
     doctor = db.Column(db.String(100), nullable=False)
     diagnosis = db.Column(db.String(200), nullable=False)
     notes = db.Column(db.Text)
+    __table_args__ = (db.Index('ix_medical_record_patient_date', 'patient_id', 'date'),)
 
 class Appointment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -58,6 +59,11 @@ class Appointment(db.Model):
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Patient history listing and per-doctor schedules
+    __table_args__ = (
+        db.Index('ix_appointment_patient_date', 'patient_id', 'date'),
+        db.Index('ix_appointment_doctor_date', 'doctor_id', 'date'),
+    )
 
 class Prescription(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -69,6 +75,7 @@ class Prescription(db.Model):
     end_date = db.Column(db.Date)
     doctor = db.Column(db.String(100), nullable=False)
     refills_left = db.Column(db.Integer, default=0)
+    __table_args__ = (db.Index('ix_prescription_patient_start_date', 'patient_id', 'start_date'),)
 
 class HealthMetric(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -76,4 +83,16 @@ class HealthMetric(db.Model):
     metric_type = db.Column(db.String(50), nullable=False)
     value = db.Column(db.Float, nullable=False)
     unit = db.Column(db.String(20))
-    date = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    date = db.Column(db.DateTime, default=datetime.utcnow)
+    # Per-patient history, and per-type date ranges (filtered listings and bucketed aggregation)
+    __table_args__ = (
+        db.Index('ix_health_metric_patient_date', 'patient_id', 'date'),
+        db.Index('ix_health_metric_patient_type_date', 'patient_id', 'metric_type', 'date'),
+    )
+
+class CacheVersion(db.Model):
+    # Shared change counter of a per-process cache (e.g. the doctor directory),
+    # bumped in the same transaction as the writes that invalidate it
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,93 @@
+"""Keyset (cursor) pagination for the per-patient history listings"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from flask import jsonify, request, url_for
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+class PaginationError(ValueError):
+    """Invalid limit, cursor or since/until parameter"""
+
+def encode_cursor(sort_value, row_id):
+    payload = json.dumps([sort_value.isoformat() if sort_value is not None else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def _parse_value(value, python_type):
+    if python_type is date:
+        return datetime.fromisoformat(value).date() if 'T' in value else date.fromisoformat(value)
+    return datetime.fromisoformat(value)
+
+def decode_cursor(cursor, python_type):
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return _parse_value(sort_value, python_type), int(row_id)
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+
+def _page_size():
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise PaginationError('limit must be an integer')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise PaginationError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    return limit
+
+def _bound(name, python_type):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return _parse_value(value, python_type)
+    except ValueError:
+        raise PaginationError(f'{name} must be an ISO 8601 date or datetime')
+
+def date_range(python_type):
+    """The request's `since` (inclusive) and `until` (exclusive) bounds as `python_type`"""
+    return _bound('since', python_type), _bound('until', python_type)
+
+def paginate_keyset(query, sort_column, id_column):
+    """
+    Newest-first page of `query` ordered by (sort_column, id_column), reading
+    `limit`, `cursor`, `since` (inclusive) and `until` (exclusive) from the
+    request. Each page is a single indexed range scan of at most limit + 1
+    rows, however long the history. Returns (rows, next_cursor), next_cursor
+    being None on the last page.
+    """
+    python_type = sort_column.type.python_type
+    limit = _page_size()
+    since, until = date_range(python_type)
+    if since is not None:
+        query = query.filter(sort_column >= since)
+    if until is not None:
+        query = query.filter(sort_column < until)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, python_type)
+        query = query.filter(or_(sort_column < sort_value,
+                                 and_(sort_column == sort_value, id_column < row_id)))
+
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+def paginated_response(items, next_cursor):
+    """
+    JSON list response for one page. The next page is advertised in the
+    X-Next-Cursor and Link headers, so the body keeps its list shape.
+    """
+    response = jsonify(items)
+    if next_cursor:
+        args = {**request.args.to_dict(), 'cursor': next_cursor}
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{url_for(request.endpoint, _external=True, **args)}>; rel="next"'
+    return response
@@ -0,0 +1,27 @@
+"""Record the SQL statements a block of code issues (see tests/test_query_counts.py)"""
+
+import contextlib
+
+from sqlalchemy import event
+
+@contextlib.contextmanager
+def _recording(engine, entry):
+    """Append entry(statement, parameters) to the yielded list for each statement executed on `engine`"""
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(entry(statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield recorded
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+def count_queries(engine):
+    """Collect the SQL statements executed on `engine` inside the block"""
+    return _recording(engine, lambda statement, parameters: statement)
+
+def capture_queries(engine):
+    """Collect (statement, parameters) for the SQL executed on `engine` inside the block"""
+    return _recording(engine, lambda statement, parameters: (statement, parameters))
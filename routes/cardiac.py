@@ -0,0 +1,129 @@
+from flask import Blueprint, request, jsonify, current_app, Response
+from flask_jwt_extended import jwt_required
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import threading
+import numpy as np
+from cardiac import CardiacDataPreprocessor, CardiacModelRegistry, predict_patient_phases
+from cardiac.batching import MicroBatcher
+from cardiac.instrumentation import PredictionMonitor
+
+cardiac = Blueprint('cardiac', __name__)
+
+# Defaults, overridable through app.config
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_TIMEOUT_S = 5.0
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+class ModelUnavailable(RuntimeError):
+    """The registry holds no compatible model to serve"""
+
+def get_cardiac_registry():
+    return CardiacModelRegistry(current_app.config.get('CARDIAC_MODEL_REGISTRY_DIR', 'model_registry'))
+
+def get_batcher():
+    """
+    Load the newest registered model once and start the shared micro-batcher.
+    Training never happens inside a request: with an empty registry this
+    raises ModelUnavailable (train at startup, see server.py).
+    """
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                bundle = get_cardiac_registry().load()
+                if bundle is None:
+                    raise ModelUnavailable('No trained cardiac model in the registry')
+                model, model_name = bundle['model'], bundle['model_name']
+                preprocessor = CardiacDataPreprocessor()
+                preprocessor.scaler, preprocessor.imputer = bundle['scaler'], bundle['imputer']
+
+                def predict_batch(rows):
+                    phases, risks = predict_patient_phases(
+                        np.vstack(rows), model, preprocessor.scaler, preprocessor.feature_names)
+                    return list(zip(phases.tolist(), risks.tolist()))
+
+                batcher = MicroBatcher(
+                    predict_batch,
+                    max_batch_size=current_app.config.get('CARDIAC_MAX_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE),
+                    max_wait_ms=current_app.config.get('CARDIAC_MAX_WAIT_MS', DEFAULT_MAX_WAIT_MS)
+                )
+                batcher.model_name = model_name
+                batcher.feature_names = preprocessor.feature_names
+                batcher.monitor = PredictionMonitor(preprocessor.scaler, preprocessor.feature_names).install()
+                _batcher = batcher.start()
+    return _batcher
+
+def _to_row(vitals, feature_names):
+    """Validate one request's vitals so a bad payload never fails a shared batch"""
+    if not isinstance(vitals, dict):
+        raise ValueError('Each patient must be an object of vital signs')
+    missing_features = [name for name in feature_names if name not in vitals]
+    if missing_features:
+        raise ValueError(f'Missing features: {", ".join(missing_features)}')
+    try:
+        row = np.array([float(vitals[name]) for name in feature_names])
+    except (TypeError, ValueError):
+        raise ValueError('All features must be numeric')
+    # float() accepts "inf" and "nan", which the model cannot score
+    if not np.isfinite(row).all():
+        raise ValueError('All features must be finite numbers')
+    return row
+
+@cardiac.route('/predict', methods=['POST'])
+@jwt_required()
+def predict_phase():
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    try:
+        batcher = get_batcher()
+    except Exception as e:
+        return jsonify({'error': 'Cardiac model unavailable', 'details': str(e)}), 503
+
+    # A single vitals object, or {"patients": [...]} for several at once
+    patients = data['patients'] if isinstance(data, dict) and 'patients' in data else [data]
+    if not isinstance(patients, list) or not patients:
+        return jsonify({'error': 'patients must be a non-empty list'}), 400
+    try:
+        rows = [_to_row(vitals, batcher.feature_names) for vitals in patients]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    futures = [batcher.submit(row) for row in rows]
+    timeout = current_app.config.get('CARDIAC_PREDICT_TIMEOUT_S', DEFAULT_TIMEOUT_S)
+    try:
+        results = [future.result(timeout=timeout) for future in futures]
+    except FutureTimeoutError:
+        return jsonify({'error': 'Prediction timed out'}), 503
+    except Exception as e:
+        return jsonify({'error': 'Prediction failed', 'details': str(e)}), 500
+
+    predictions = [{'predicted_phase': phase, 'risk_level': risk} for phase, risk in results]
+    if 'patients' in data:
+        return jsonify({'model': batcher.model_name, 'predictions': predictions}), 200
+    return jsonify({'model': batcher.model_name, **predictions[0]}), 200
+
+@cardiac.route('/stats', methods=['GET'])
+@jwt_required()
+def get_prediction_stats():
+    if _batcher is None:
+        return jsonify({'status': 'idle', 'queue_depth': 0, 'batches': 0}), 200
+    return jsonify({'status': 'running', 'model': _batcher.model_name, **_batcher.stats()}), 200
+
+@cardiac.route('/metrics', methods=['GET'])
+@jwt_required()
+def get_prediction_metrics():
+    """
+    Latency histograms, phase counts and feature drift; Prometheus text, or
+    JSON with ?format=json. Phase and drift figures describe patients, so
+    scrapers authenticate like API clients (a bearer token).
+    """
+    if _batcher is None:
+        return jsonify({'status': 'idle'}), 200
+    if request.args.get('format') == 'json':
+        return jsonify({'model': _batcher.model_name, **_batcher.monitor.snapshot()}), 200
+    return Response(_batcher.monitor.prometheus(), mimetype='text/plain; version=0.0.4')
@@ -1,24 +1,38 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, MedicalRecord, Appointment, Prescription, HealthMetric, Doctor
+from metric_ingest import BulkIngestError, parse_bulk_body, validate_metric_rows
+from metric_aggregation import AggregationError, aggregate_metrics, downsample_buckets
+from pagination import MAX_PAGE_SIZE, PaginationError, date_range, paginate_keyset, paginated_response
+from doctor_directory import SEARCH_FILTERS, DirectoryCache, SearchError, serialize_doctor
+from sqlalchemy import insert
+from sqlalchemy.orm import contains_eager, load_only
 from datetime import datetime
 
 medical = Blueprint('medical', __name__)
 
+# Serialized active-doctor directory, rebuilt only after a doctor write (in any worker)
+doctor_directory = DirectoryCache(
+    lambda: [serialize_doctor(doc) for doc in Doctor.query.filter_by(isActive=True).all()], 'doctors')
+
 # Medical Records Routes
 @medical.route('/records', methods=['GET'])
 @jwt_required()
 def get_medical_records():
     current_user_id = get_jwt_identity()
-    records = MedicalRecord.query.filter_by(patient_id=current_user_id).all()
-    
-    return jsonify([{
+    try:
+        records, next_cursor = paginate_keyset(
+            MedicalRecord.query.filter_by(patient_id=current_user_id), MedicalRecord.date, MedicalRecord.id)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return paginated_response([{
         'id': record.id,
         'date': record.date.isoformat(),
         'doctor': record.doctor,
         'diagnosis': record.diagnosis,
         'notes': record.notes
-    } for record in records]), 200
+    } for record in records], next_cursor), 200
 
 @medical.route('/records', methods=['POST'])
 @jwt_required()
@@ -56,9 +70,19 @@ def add_medical_record():
 @jwt_required()
 def get_appointments():
     current_user_id = get_jwt_identity()
-    appointments = Appointment.query.filter_by(patient_id=current_user_id).join(Doctor).all()
-    
-    return jsonify([{
+    # The doctor comes from the same joined SELECT, and only the serialized
+    # columns of either table are loaded
+    query = Appointment.query.filter_by(patient_id=current_user_id).join(Appointment.assigned_doctor).options(
+        load_only(Appointment.id, Appointment.date, Appointment.time, Appointment.status, Appointment.type,
+                  Appointment.notes, Appointment.created_at, Appointment.updated_at),
+        contains_eager(Appointment.assigned_doctor).load_only(Doctor.id, Doctor.name, Doctor.specialty, Doctor.imageUrl)
+    )
+    try:
+        appointments, next_cursor = paginate_keyset(query, Appointment.date, Appointment.id)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return paginated_response([{
         'id': appt.id,
         'doctor': {
             'id': appt.assigned_doctor.id,
@@ -73,7 +97,7 @@ def get_appointments():
         'notes': appt.notes,
         'created_at': appt.created_at.isoformat(),
         'updated_at': appt.updated_at.isoformat()
-    } for appt in appointments]), 200
+    } for appt in appointments], next_cursor), 200
 
 @medical.route('/appointments', methods=['POST'])
 @jwt_required()
@@ -164,9 +188,13 @@ def update_appointment(appointment_id):
 @jwt_required()
 def get_prescriptions():
     current_user_id = get_jwt_identity()
-    prescriptions = Prescription.query.filter_by(patient_id=current_user_id).all()
-    
-    return jsonify([{
+    try:
+        prescriptions, next_cursor = paginate_keyset(
+            Prescription.query.filter_by(patient_id=current_user_id), Prescription.start_date, Prescription.id)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return paginated_response([{
         'id': rx.id,
         'name': rx.name,
         'dosage': rx.dosage,
@@ -175,7 +203,7 @@ def get_prescriptions():
         'end_date': rx.end_date.isoformat() if rx.end_date else None,
         'doctor': rx.doctor,
         'refills_left': rx.refills_left
-    } for rx in prescriptions]), 200
+    } for rx in prescriptions], next_cursor), 200
 
 @medical.route('/prescriptions', methods=['POST'])
 @jwt_required()
@@ -218,27 +246,59 @@ def get_doctors():
         return '', 204
     
     try:
-        doctors = Doctor.query.filter_by(isActive=True).all()
-        return jsonify([{
-            'id': doc.id,
-            'name': doc.name,
-            'specialty': doc.specialty,
-            'imageUrl': doc.imageUrl,
-            'availableDates': doc.availableDates,
-            'qualifications': doc.qualifications,
-            'experience': doc.experience,
-            'languages': doc.languages,
-            'bio': doc.bio,
-            'rating': doc.rating,
-            'email': doc.email,
-            'phone': doc.phone,
-            'consultationTypes': doc.consultationTypes,
-            'fees': doc.fees,
-            'isActive': doc.isActive
-        } for doc in doctors]), 200
+        return doctor_directory.response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _search_number(name, parse, minimum=0):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        number = parse(value)
+    except ValueError:
+        raise SearchError(f'{name} must be a number')
+    if number < minimum:
+        raise SearchError(f'{name} must be at least {minimum}')
+    return number
+
+@medical.route('/doctors/search', methods=['GET', 'OPTIONS'])
+def search_doctors():
+    if request.method == 'OPTIONS':
+        return '', 204
+
+    try:
+        # Each filter takes repeated or comma-separated values
+        filters = {}
+        for param in SEARCH_FILTERS:
+            values = [value for arg in request.args.getlist(param) for value in arg.split(',') if value.strip()]
+            if values:
+                filters[param] = values
+        min_fee, max_fee = _search_number('min_fee', float), _search_number('max_fee', float)
+        offset = _search_number('offset', int) or 0
+        limit = _search_number('limit', int, minimum=1) or 20
+        if limit > MAX_PAGE_SIZE:
+            raise SearchError(f'limit must be at most {MAX_PAGE_SIZE}')
+        sort = request.args.get('sort', 'rating')
+        order = request.args.get('order', 'asc' if sort in ('fees', 'name') else 'desc')
+        if order not in ('asc', 'desc'):
+            raise SearchError('order must be asc or desc')
+
+        total, doctors = doctor_directory.get().search_index.search(
+            filters, min_fee=min_fee, max_fee=max_fee, sort=sort, descending=order == 'desc',
+            offset=offset, limit=limit)
+    except SearchError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    response = jsonify(doctors)
+    response.headers['X-Total-Count'] = str(total)
+    if offset + limit < total:
+        args = {**request.args.to_dict(flat=False), 'offset': offset + limit}
+        response.headers['Link'] = f'<{url_for(request.endpoint, _external=True, **args)}>; rel="next"'
+    return response, 200
+
 @medical.route('/doctors', methods=['POST', 'OPTIONS'])
 @jwt_required(optional=True)
 def add_doctor():
@@ -297,27 +357,12 @@ def add_doctor():
         )
         
         db.session.add(new_doctor)
+        doctor_directory.touch()
         db.session.commit()
         
         return jsonify({
             'message': 'Doctor added successfully',
-            'doctor': {
-                'id': new_doctor.id,
-                'name': new_doctor.name,
-                'specialty': new_doctor.specialty,
-                'imageUrl': new_doctor.imageUrl,
-                'availableDates': new_doctor.availableDates,
-                'qualifications': new_doctor.qualifications,
-                'experience': new_doctor.experience,
-                'languages': new_doctor.languages,
-                'bio': new_doctor.bio,
-                'rating': new_doctor.rating,
-                'email': new_doctor.email,
-                'phone': new_doctor.phone,
-                'consultationTypes': new_doctor.consultationTypes,
-                'fees': new_doctor.fees,
-                'isActive': new_doctor.isActive
-            }
+            'doctor': serialize_doctor(new_doctor)
         }), 201
     except Exception as e:
         db.session.rollback()
@@ -348,26 +393,11 @@ def update_doctor(doctor_id):
             if hasattr(doctor, key):
                 setattr(doctor, key, value)
         
+        doctor_directory.touch()
         db.session.commit()
         return jsonify({
             'message': 'Doctor updated successfully',
-            'doctor': {
-                'id': doctor.id,
-                'name': doctor.name,
-                'specialty': doctor.specialty,
-                'imageUrl': doctor.imageUrl,
-                'availableDates': doctor.availableDates,
-                'qualifications': doctor.qualifications,
-                'experience': doctor.experience,
-                'languages': doctor.languages,
-                'bio': doctor.bio,
-                'rating': doctor.rating,
-                'email': doctor.email,
-                'phone': doctor.phone,
-                'consultationTypes': doctor.consultationTypes,
-                'fees': doctor.fees,
-                'isActive': doctor.isActive
-            }
+            'doctor': serialize_doctor(doctor)
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -397,6 +427,7 @@ def delete_doctor(doctor_id):
         }
         
         db.session.delete(doctor)
+        doctor_directory.touch()
         db.session.commit()
         
         return jsonify({
@@ -422,20 +453,45 @@ def delete_doctor(doctor_id):
 def get_health_metrics():
     current_user_id = get_jwt_identity()
     metric_type = request.args.get('type')
+    if request.args.get('bucket'):
+        return get_health_metric_buckets(current_user_id, metric_type)
     
     query = HealthMetric.query.filter_by(patient_id=current_user_id)
     if metric_type:
         query = query.filter_by(metric_type=metric_type)
     
-    metrics = query.order_by(HealthMetric.date.desc()).all()
-    
-    return jsonify([{
+    try:
+        metrics, next_cursor = paginate_keyset(query, HealthMetric.date, HealthMetric.id)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return paginated_response([{
         'id': metric.id,
         'metric_type': metric.metric_type,
         'value': metric.value,
         'unit': metric.unit,
         'date': metric.date.isoformat()
-    } for metric in metrics]), 200
+    } for metric in metrics], next_cursor), 200
+
+def get_health_metric_buckets(current_user_id, metric_type):
+    """Aggregated mode of get_health_metrics: one row per time bucket"""
+    try:
+        if not metric_type:
+            raise AggregationError('type is required with bucket')
+        since, until = date_range(datetime)
+        buckets = aggregate_metrics(db.session, HealthMetric, current_user_id, metric_type,
+                                    request.args['bucket'], since=since, until=until)
+        points = request.args.get('points')
+        if points:
+            try:
+                points = int(points)
+            except ValueError:
+                raise AggregationError('points must be an integer')
+            buckets = downsample_buckets(buckets, points)
+    except (AggregationError, PaginationError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(buckets), 200
 
 @medical.route('/metrics', methods=['POST'])
 @jwt_required()
@@ -465,4 +521,35 @@ def add_health_metric():
         return jsonify({
             'error': 'Failed to add doctor',
             'details': error_message
-        }), 500
\ No newline at end of file
+        }), 500
+
+@medical.route('/metrics/bulk', methods=['POST'])
+@jwt_required()
+def add_health_metrics_bulk():
+    current_user_id = get_jwt_identity()
+    try:
+        items = parse_bulk_body(request)
+    except BulkIngestError as e:
+        return jsonify({'error': str(e)}), 400
+
+    rows, errors = validate_metric_rows(items, int(current_user_id))
+    if not rows:
+        return jsonify({'error': 'No valid readings', 'inserted': 0, 'rejected': len(errors), 'errors': errors}), 400
+
+    try:
+        # One executemany in one transaction for the whole batch
+        db.session.execute(insert(HealthMetric), rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'error': 'Failed to add health metrics',
+            'details': str(e)
+        }), 500
+
+    return jsonify({
+        'message': 'Health metrics added successfully',
+        'inserted': len(rows),
+        'rejected': len(errors),
+        'errors': errors
+    }), 201
@@ -4,11 +4,14 @@ from app import app, db
 from routes.auth import auth
 from routes.medical import medical
 from routes.emergency import emergency
+from routes.cardiac import cardiac, get_cardiac_registry
+from cardiac import load_or_train_cardiac_model
 
 # Register blueprints
 app.register_blueprint(auth, url_prefix='/api/auth')
 app.register_blueprint(medical, url_prefix='/api/medical')
 app.register_blueprint(emergency, url_prefix='/api/emergency')
+app.register_blueprint(cardiac, url_prefix='/api/cardiac')
 
 # Enable CORS for all routes
 CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -32,6 +35,8 @@ if __name__ == '__main__':
     # Create all database tables
     with app.app_context():
         db.create_all()
+        # Register a cardiac model before serving; prediction requests never train
+        load_or_train_cardiac_model(get_cardiac_registry())
     
     # Start the server
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
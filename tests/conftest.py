@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def medical_app():
+    """The medical blueprint on an in-memory database, with JWT auth"""
+    from flask import Flask
+    from flask_jwt_extended import JWTManager
+    from models import db
+    from routes.medical import medical
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-at-least-32-bytes'
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(medical, url_prefix='/api/medical')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def auth_headers():
+    from flask_jwt_extended import create_access_token
+
+    def headers(patient_id):
+        return {'Authorization': f'Bearer {create_access_token(str(patient_id))}'}
+    return headers
+
+@pytest.fixture(scope='session')
+def cardiac_cohort():
+    """A small synthetic cohort: every model feature plus the physiological_phase label"""
+    import pandas as pd
+    from cardiac.dataset import iter_cardiac_cohort
+
+    return pd.concat(iter_cardiac_cohort(2000, chunk_size=1000, seed=7), ignore_index=True)
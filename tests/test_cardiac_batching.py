@@ -0,0 +1,62 @@
+"""MicroBatcher batches concurrent submissions and confines a failure to the item that caused it"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from cardiac.batching import MicroBatcher
+
+def _doubling(items):
+    if any(item < 0 for item in items):
+        raise ValueError('negative item')
+    return [2 * item for item in items]
+
+def test_results_follow_their_items():
+    batcher = MicroBatcher(_doubling, max_batch_size=8, max_wait_ms=20).start()
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            futures = list(pool.map(batcher.submit, range(40)))
+        assert [future.result(timeout=5) for future in futures] == [2 * i for i in range(40)]
+        stats = batcher.stats()
+        assert stats['items'] == 40 and stats['max_batch_size'] <= 8 and stats['errors'] == 0
+    finally:
+        batcher.close()
+
+def test_failing_batch_is_retried_one_by_one():
+    batches = []
+
+    def predict_batch(items):
+        batches.append(list(items))
+        return _doubling(items)
+
+    batcher = MicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=200)
+    try:
+        # Queue everything before the worker starts so it lands in one batch
+        futures = []
+        for item in (1, -1, 3):
+            futures.append(Future())
+            batcher._queue.put((item, futures[-1]))
+        batcher.start()
+        assert futures[0].result(timeout=5) == 2
+        assert futures[2].result(timeout=5) == 6
+        with pytest.raises(ValueError):
+            futures[1].result(timeout=5)
+    finally:
+        batcher.close()
+    assert batches == [[1, -1, 3], [1], [-1], [3]]
+    assert batcher.stats()['errors'] == 1
+
+def test_stats_require_a_token():
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+    from routes.cardiac import cardiac
+
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-at-least-32-bytes'
+    JWTManager(app)
+    app.register_blueprint(cardiac, url_prefix='/api/cardiac')
+    client = app.test_client()
+    assert client.get('/api/cardiac/stats').status_code == 401
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token("1")}'}
+    assert client.get('/api/cardiac/stats', headers=headers).status_code == 200
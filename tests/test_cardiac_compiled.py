@@ -0,0 +1,42 @@
+"""Compiled (pure-NumPy) models score raw rows exactly like the sklearn models and scaler they came from"""
+
+import numpy as np
+import pytest
+
+from cardiac import CardiacDataPreprocessor, compile_cardiac_model
+
+@pytest.fixture(scope='module')
+def training_data(cardiac_cohort):
+    preprocessor = CardiacDataPreprocessor()
+    X, y = preprocessor.preprocess(cardiac_cohort)
+    raw = cardiac_cohort[preprocessor.feature_names].to_numpy()
+    return X.to_numpy(), y.to_numpy(), raw, preprocessor.scaler
+
+def test_forest_parity(training_data):
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y, raw, scaler = training_data
+    forest = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+    compiled = compile_cardiac_model(forest, scaler)
+    expected = forest.predict_proba(scaler.transform(raw))
+    np.testing.assert_allclose(compiled.predict_proba(raw), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(raw), forest.predict(scaler.transform(raw)))
+    np.testing.assert_array_equal(compiled.predict(raw[0]), forest.predict(scaler.transform(raw[:1])))
+
+@pytest.mark.parametrize('estimator', ['logistic', 'sgd'])
+def test_linear_parity(training_data, estimator):
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+    X, y, raw, scaler = training_data
+    model = (LogisticRegression(max_iter=500) if estimator == 'logistic'
+             else SGDClassifier(loss='log_loss', random_state=0)).fit(X, y)
+    compiled = compile_cardiac_model(model, scaler)
+    np.testing.assert_allclose(compiled.decision_function(raw), model.decision_function(scaler.transform(raw)),
+                               rtol=1e-9, atol=1e-9)
+    np.testing.assert_array_equal(compiled.predict(raw), model.predict(scaler.transform(raw)))
+
+def test_unsupported_model():
+    from sklearn.tree import DecisionTreeClassifier
+
+    with pytest.raises(TypeError):
+        compile_cardiac_model(DecisionTreeClassifier())
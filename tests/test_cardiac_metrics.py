@@ -0,0 +1,19 @@
+"""The prediction metrics describe patients, so they are only served to authenticated callers"""
+
+import pytest
+
+@pytest.mark.parametrize('query', ['', '?format=json'])
+def test_metrics_require_a_token(query):
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+    from routes.cardiac import cardiac
+
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-at-least-32-bytes'
+    JWTManager(app)
+    app.register_blueprint(cardiac, url_prefix='/api/cardiac')
+    client = app.test_client()
+    assert client.get(f'/api/cardiac/metrics{query}').status_code == 401
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token("1")}'}
+    assert client.get(f'/api/cardiac/metrics{query}', headers=headers).status_code == 200
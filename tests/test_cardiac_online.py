@@ -0,0 +1,41 @@
+"""The online learner checkpoints apart from the serving registry and resumes where it stopped"""
+
+import numpy as np
+
+from cardiac import CardiacModelRegistry
+from cardiac.online import ONLINE_MODEL_NAME, OnlineCardiacLearner, resume_online_learner
+
+def test_checkpoint_resume_and_promote(tmp_path, cardiac_cohort):
+    checkpoints = CardiacModelRegistry(str(tmp_path / 'checkpoints'))
+    serving = CardiacModelRegistry(str(tmp_path / 'serving'))
+    features = cardiac_cohort.drop(columns=['patient_id', 'physiological_phase'])
+    labels = cardiac_cohort['physiological_phase'].to_numpy()
+    raw = cardiac_cohort[list(features.columns)].to_numpy()
+
+    learner = OnlineCardiacLearner(registry=checkpoints, holdout=(features[:500], labels[:500]), checkpoint_every=2)
+    try:
+        for start in range(0, 1000, 250):
+            learner.partial_fit(features[start:start + 250], labels[start:start + 250])
+        assert learner.checkpoints == [1, 2]
+        evaluations = learner.wait_for_evaluations()
+        assert len(evaluations) == 2 and evaluations[-1]['rows_seen'] == 1000
+        assert serving.load() is None
+        expected = learner.predict(raw)
+    finally:
+        learner.close()
+
+    resumed = resume_online_learner(checkpoints, checkpoint_every=0)
+    try:
+        assert (resumed.rows_seen, resumed.batches_seen) == (1000, 4)
+        np.testing.assert_array_equal(resumed.predict(raw), expected)
+        # The checkpoint's imputer fills missing values like the learner does
+        bundle = checkpoints.load(model_name=ONLINE_MODEL_NAME)
+        np.testing.assert_allclose(bundle['imputer'].statistics_, bundle['scaler'].mean_)
+
+        resumed.partial_fit(features[1000:1250], labels[1000:1250])
+        assert resumed.rows_seen == 1250
+        assert resumed.promote(serving) == 1
+        assert serving.load()['model_name'] == ONLINE_MODEL_NAME
+        assert checkpoints.versions() == [1, 2]
+    finally:
+        resumed.close()
@@ -0,0 +1,32 @@
+"""preprocess_compact() fits the same statistics as preprocess(), up to float32 rounding"""
+
+import numpy as np
+
+from cardiac import CardiacDataPreprocessor
+
+def test_compact_matches_preprocess(cardiac_cohort):
+    from sklearn.linear_model import LogisticRegression
+
+    cohort = cardiac_cohort.copy()
+    # Missing readings exercise the median imputation
+    cohort.loc[::7, 'heart_rate'] = np.nan
+    cohort.loc[::11, 'oxygen_saturation'] = np.nan
+
+    reference, compact = CardiacDataPreprocessor(), CardiacDataPreprocessor()
+    X_reference, y_reference = reference.preprocess(cohort)
+    X_compact, y_compact = compact.preprocess_compact(cohort)
+
+    assert X_compact.dtype == np.float32 and X_compact.flags['F_CONTIGUOUS']
+    np.testing.assert_array_equal(y_compact, y_reference.to_numpy())
+    np.testing.assert_allclose(compact.imputer.statistics_, reference.imputer.statistics_, rtol=1e-6)
+    np.testing.assert_allclose(compact.scaler.mean_, reference.scaler.mean_, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(compact.scaler.scale_, reference.scaler.scale_, rtol=1e-5)
+    np.testing.assert_allclose(X_compact, X_reference.to_numpy(), rtol=1e-4, atol=1e-4)
+
+    raw = cohort[reference.feature_names].to_numpy()
+    np.testing.assert_allclose(compact.transform(raw), reference.transform(raw), rtol=1e-4, atol=1e-4)
+    model_reference = LogisticRegression(max_iter=500).fit(X_reference.to_numpy(), y_reference)
+    model_compact = LogisticRegression(max_iter=500).fit(X_compact, y_compact)
+    agreement = np.mean(model_compact.predict(compact.transform(raw)) ==
+                        model_reference.predict(reference.transform(raw)))
+    assert agreement >= 0.995
@@ -0,0 +1,59 @@
+"""Model bundles round-trip through the registry, and damaged or foreign bundles are skipped"""
+
+import json
+
+import numpy as np
+
+from cardiac import CardiacDataPreprocessor, CardiacModelRegistry
+
+def _trained(cohort):
+    from sklearn.linear_model import LogisticRegression
+
+    preprocessor = CardiacDataPreprocessor()
+    X, y = preprocessor.preprocess_compact(cohort)
+    return LogisticRegression(max_iter=500).fit(X, y), preprocessor
+
+def test_round_trip_scores_like_the_saved_model(tmp_path, cardiac_cohort):
+    model, preprocessor = _trained(cardiac_cohort)
+    registry = CardiacModelRegistry(str(tmp_path))
+    assert registry.save(model, 'Logistic Regression', preprocessor, metrics={'accuracy': 0.9}) == 1
+
+    bundle = registry.load()
+    raw = cardiac_cohort[preprocessor.feature_names].to_numpy()
+    assert bundle['version'] == 1 and bundle['metrics'] == {'accuracy': 0.9}
+    assert bundle['feature_names'] == preprocessor.feature_names
+    np.testing.assert_array_equal(
+        bundle['model'].predict(bundle['scaler'].transform(bundle['imputer'].transform(raw))),
+        model.predict(preprocessor.transform(raw)))
+
+def test_checksum_mismatch_falls_back_to_the_previous_version(tmp_path, cardiac_cohort):
+    model, preprocessor = _trained(cardiac_cohort)
+    registry = CardiacModelRegistry(str(tmp_path))
+    registry.save(model, 'Logistic Regression', preprocessor)
+    registry.save(model, 'Logistic Regression', preprocessor)
+    artifact_path, _ = registry._paths(2)
+    with open(artifact_path, 'r+b') as f:
+        f.seek(-1, 2)
+        last = f.read(1)
+        f.seek(-1, 2)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    assert registry.load()['version'] == 1
+    assert registry.load(version=2) is None
+
+def test_incompatible_and_foreign_bundles_are_skipped(tmp_path, cardiac_cohort):
+    model, preprocessor = _trained(cardiac_cohort)
+    registry = CardiacModelRegistry(str(tmp_path))
+    registry.save(model, 'Logistic Regression', preprocessor)
+    registry.save(model, 'Other Model', preprocessor)
+    assert registry.load()['version'] == 2
+    assert registry.load(model_name='Logistic Regression')['version'] == 1
+
+    _, manifest_path = registry._paths(2)
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['feature_names'] = list(reversed(manifest['feature_names']))
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    assert registry.load()['version'] == 1
+    assert CardiacModelRegistry(str(tmp_path / 'empty')).load() is None
@@ -0,0 +1,65 @@
+"""A cohort written to a columnar store reads back unchanged, chunk by chunk or by row"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cardiac import PHASE_MAP
+from cardiac.storage import CohortStore, convert_csv_to_cohort_store, read_store_header
+
+def _chunks(cohort, size):
+    return (cohort.iloc[start:start + size] for start in range(0, len(cohort), size))
+
+def test_round_trip(tmp_path, cardiac_cohort):
+    store = CohortStore.write(str(tmp_path / 'ward.cohort'), _chunks(cardiac_cohort, 300))
+    assert len(store) == len(cardiac_cohort) and store.columns == list(cardiac_cohort.columns)
+    assert read_store_header(store.path)['n_rows'] == len(cardiac_cohort)
+
+    restored = pd.concat(store.iter_chunks(chunk_size=700))
+    pd.testing.assert_series_equal(restored['physiological_phase'], cardiac_cohort['physiological_phase'],
+                                   check_dtype=False)
+    np.testing.assert_array_equal(restored['patient_id'], cardiac_cohort['patient_id'])
+    # Vitals are stored as float32
+    np.testing.assert_allclose(restored['heart_rate'], cardiac_cohort['heart_rate'], rtol=1e-6)
+
+    features = ['heart_rate', 'systolic_bp', 'compensatory_index']
+    expected_X = cardiac_cohort[features].to_numpy(dtype=np.float32)
+    expected_y = cardiac_cohort['physiological_phase'].map(PHASE_MAP).to_numpy()
+    X, y = zip(*store.iter_arrays(features, chunk_size=512, start=100, stop=1900))
+    np.testing.assert_array_equal(np.vstack(X), expected_X[100:1900])
+    np.testing.assert_array_equal(np.concatenate(y), expected_y[100:1900])
+
+    rows = np.array([0, 5, 999, 1999])
+    X_rows, y_rows = store.take_rows(features, rows)
+    assert X_rows.flags['F_CONTIGUOUS']
+    np.testing.assert_array_equal(X_rows, expected_X[rows])
+    np.testing.assert_array_equal(y_rows, expected_y[rows])
+
+def test_csv_conversion_and_rejected_input(tmp_path, cardiac_cohort):
+    csv_path = tmp_path / 'export.csv'
+    cardiac_cohort.to_csv(csv_path, index=False)
+    store = convert_csv_to_cohort_store(str(csv_path), str(tmp_path / 'export.cohort'), chunk_size=450)
+    np.testing.assert_array_equal(store.phase_codes(), cardiac_cohort['physiological_phase'].map(PHASE_MAP))
+
+    unknown = cardiac_cohort.head(3).assign(physiological_phase='unknown')
+    with pytest.raises(ValueError):
+        CohortStore.write(str(tmp_path / 'bad.cohort'), [unknown])
+    with pytest.raises(ValueError):
+        CohortStore.write(str(tmp_path / 'empty.cohort'), [])
+    with pytest.raises(KeyError):
+        store.column('not_a_column')
+
+def test_out_of_core_training_on_a_phase_sorted_store(tmp_path):
+    from cardiac.dataset import iter_cardiac_cohort
+    from cardiac.training import train_cardiac_model_out_of_core
+
+    cohort = pd.concat(iter_cardiac_cohort(20_000, chunk_size=10_000, seed=11), ignore_index=True)
+    cohort = cohort.sort_values('physiological_phase', kind='stable')
+    store = CohortStore.write(str(tmp_path / 'sorted.cohort'), _chunks(cohort, 5000))
+
+    model, _, preprocessor = train_cardiac_model_out_of_core(
+        store, estimator='forest', chunk_size=4000, holdout_rows=2000, trees_per_chunk=5, max_trees=20, max_depth=8)
+    assert len(model.estimators_) == 20
+    raw = cohort[preprocessor.feature_names].to_numpy()
+    labels = cohort['physiological_phase'].map(PHASE_MAP).to_numpy()
+    assert np.mean(model.predict(preprocessor.transform(raw)) == labels) > 0.9
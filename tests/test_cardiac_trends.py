@@ -0,0 +1,53 @@
+"""VitalsTrendBuffer's constant-time statistics match a direct computation over the same readings"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from cardiac import TREND_VITALS, VitalsTrendBuffer
+
+def _readings(n, seed=3):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    for i in range(n):
+        vitals = {vital: float(value) for vital, value in zip(TREND_VITALS, rng.normal(80, 15, len(TREND_VITALS)))}
+        yield vitals, start + timedelta(minutes=15 * i)
+
+def test_window_statistics_and_trends_after_wraparound():
+    buffer = VitalsTrendBuffer(capacity=40, window=12, readings_per_hour=4)
+    readings = list(_readings(100))
+    history = np.empty((0, len(TREND_VITALS)))
+    for count, (vitals, timestamp) in enumerate(readings, start=1):
+        buffer.append(vitals, timestamp)
+        history = np.vstack([history, [vitals[vital] for vital in TREND_VITALS]])
+        if count not in (1, 5, 12, 13, 39, 40, 41, 100):
+            continue
+        window = history[-12:]
+        for i, vital in enumerate(TREND_VITALS):
+            stats = buffer.stats(vital)
+            assert stats['mean'] == pytest.approx(window[:, i].mean())
+            assert stats['variance'] == pytest.approx(window[:, i].var())
+            assert stats['min'] == window[:, i].min() and stats['max'] == window[:, i].max()
+            expected_1h = history[-1, i] - history[-5, i] if count > 4 else 0.0
+            expected_6h = history[-1, i] - history[-25, i] if count > 24 else 0.0
+            assert buffer.trend(vital, 1) == pytest.approx(expected_1h)
+            assert buffer.trend(vital, 6) == pytest.approx(expected_6h)
+
+    assert len(buffer) == 40
+    frame = buffer.to_frame()
+    np.testing.assert_allclose(frame[TREND_VITALS].to_numpy(), history[-40:])
+    assert frame['timestamp'].is_monotonic_increasing
+    assert frame['timestamp'].iloc[-1] == readings[-1][1]
+
+def test_reset_and_invalid_sizes():
+    buffer = VitalsTrendBuffer()
+    for vitals, timestamp in _readings(3):
+        buffer.append(vitals, timestamp)
+    buffer.reset()
+    assert len(buffer) == 0 and np.isnan(buffer.stats('heart_rate')['mean'])
+    assert buffer.compensatory_index() == 0.0
+    with pytest.raises(ValueError):
+        VitalsTrendBuffer(capacity=10, window=24)
+    with pytest.raises(ValueError):
+        VitalsTrendBuffer(capacity=24, window=24)
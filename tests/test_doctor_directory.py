@@ -0,0 +1,57 @@
+"""A doctor write handled by one worker reaches the directory cache of every other worker"""
+
+def test_directory_follows_writes_from_other_workers(medical_app):
+    from models import db, Doctor
+    from doctor_directory import DirectoryCache, serialize_doctor
+    from routes.medical import doctor_directory
+
+    db.session.add(Doctor(name='Dr. Before', email='before@example.com', specialty='Cardiology', isActive=True))
+    db.session.commit()
+
+    # A second process's cache: same build and version row, separate memory
+    other_worker = DirectoryCache(
+        lambda: [serialize_doctor(doc) for doc in Doctor.query.filter_by(isActive=True).all()], 'doctors')
+    with medical_app.test_request_context():
+        before = other_worker.get()
+        assert other_worker.get() is before
+        assert [doc['name'] for doc in before.doctors] == ['Dr. Before']
+
+    client = medical_app.test_client()
+    doctor_id = before.doctors[0]['id']
+    assert client.put(f'/api/medical/doctors/{doctor_id}', json={'name': 'Dr. After'}).status_code == 200
+    db.session.remove()
+
+    response = client.get('/api/medical/doctors')
+    with medical_app.test_request_context():
+        after = other_worker.get()
+        search_total, found = after.search_index.search({'specialty': ['cardiology']})
+    assert [doc['name'] for doc in after.doctors] == ['Dr. After']
+    assert search_total == 1 and found[0]['name'] == 'Dr. After'
+
+    # Both workers send the same validators for the same version
+    assert response.headers['ETag'].strip('"') == after.etag
+    assert response.headers['Last-Modified'] is not None
+    assert doctor_directory.get().last_modified == after.last_modified
+
+def test_no_last_modified_before_the_first_write(medical_app):
+    from models import db, CacheVersion, Doctor
+
+    db.session.add(Doctor(name='Dr. Early', email='early@example.com', specialty='Cardiology', isActive=True))
+    db.session.commit()
+    client = medical_app.test_client()
+    response = client.get('/api/medical/doctors')
+    assert response.status_code == 200 and 'Last-Modified' not in response.headers
+    stale_etag = response.headers['ETag']
+
+    # The first write creates the version row through the upsert, the next one bumps it
+    doctor_id = response.get_json()[0]['id']
+    assert client.put(f'/api/medical/doctors/{doctor_id}', json={'name': 'Dr. Later'}).status_code == 200
+    assert client.put(f'/api/medical/doctors/{doctor_id}', json={'bio': 'Edited'}).status_code == 200
+    db.session.remove()
+    assert db.session.get(CacheVersion, 'doctors').version == 2
+
+    response = client.get('/api/medical/doctors', headers={'If-None-Match': stale_etag})
+    assert response.status_code == 200 and response.get_json()[0]['name'] == 'Dr. Later'
+    assert 'Last-Modified' in response.headers
+    revalidated = client.get('/api/medical/doctors', headers={'If-Modified-Since': response.headers['Last-Modified']})
+    assert revalidated.status_code == 304
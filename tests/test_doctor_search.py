@@ -0,0 +1,88 @@
+"""GET /api/medical/doctors/search: filters, fee bounds, sorting, paging and parameter errors"""
+
+import pytest
+
+DOCTORS = [
+    # name, specialty, languages, consultation types, available dates, fees, rating, experience
+    ('Alice', 'Cardiology', ['English', 'Spanish'], ['video', 'in-person'], ['2024-05-01'], 100, 4.5, 10),
+    ('bob', 'Cardiology', ['English'], ['in-person'], [], 200, 4.9, 5),
+    ('Carol', 'Neurology', ['Spanish'], ['video'], [], None, None, None),
+    ('Dave', 'Dermatology', ['French', 'English'], ['video'], ['2024-05-01', '2024-05-02'], 50, 3.0, 20),
+    ('Eve', 'Cardiology', ['French'], ['video'], [], 150, 4.5, 10)
+]
+
+@pytest.fixture
+def search(medical_app):
+    from models import db, Doctor
+
+    for name, specialty, languages, types, dates, fees, rating, experience in DOCTORS:
+        db.session.add(Doctor(name=name, email=f'{name.lower()}@example.com', specialty=specialty,
+                              languages=languages, consultationTypes=types, availableDates=dates,
+                              fees=fees, rating=rating, experience=experience, isActive=True))
+    db.session.add(Doctor(name='Inactive', email='inactive@example.com', specialty='Cardiology',
+                          languages=['English'], consultationTypes=['video'], fees=120, rating=5.0, isActive=False))
+    db.session.commit()
+    # The rating column defaults to 5.0 on insert, so a missing rating is set afterwards
+    db.session.execute(db.update(Doctor).where(Doctor.name == 'Carol').values(rating=None))
+    db.session.commit()
+    client = medical_app.test_client()
+
+    def get(query=''):
+        return client.get(f'/api/medical/doctors/search?{query}')
+    return get
+
+def _names(response):
+    assert response.status_code == 200, response.get_json()
+    return [doctor['name'] for doctor in response.get_json()]
+
+@pytest.mark.parametrize('query, expected', [
+    ('', ['bob', 'Alice', 'Eve', 'Dave', 'Carol']),
+    ('specialty=cardiology&language=FRENCH', ['Eve']),
+    ('specialty=Cardiology,Neurology', ['bob', 'Alice', 'Eve', 'Carol']),
+    ('specialty=Neurology&specialty=Dermatology', ['Dave', 'Carol']),
+    ('language=english&consultation_type=video', ['Alice', 'Dave']),
+    ('available_on=2024-05-01', ['Alice', 'Dave']),
+    ('specialty=Oncology', []),
+    ('min_fee=100&max_fee=150', ['Alice', 'Eve']),
+    ('max_fee=60', ['Dave']),
+    ('min_fee=0', ['bob', 'Alice', 'Eve', 'Dave']),
+    ('specialty=cardiology&min_fee=120', ['bob', 'Eve'])
+])
+def test_filters(search, query, expected):
+    response = search(query)
+    assert _names(response) == expected
+    assert response.headers['X-Total-Count'] == str(len(expected))
+
+@pytest.mark.parametrize('sort, order, expected', [
+    ('rating', 'desc', ['bob', 'Alice', 'Eve', 'Dave', 'Carol']),
+    ('rating', 'asc', ['Dave', 'Alice', 'Eve', 'bob', 'Carol']),
+    ('fees', 'asc', ['Dave', 'Alice', 'Eve', 'bob', 'Carol']),
+    ('fees', 'desc', ['bob', 'Eve', 'Alice', 'Dave', 'Carol']),
+    ('experience', 'desc', ['Dave', 'Alice', 'Eve', 'bob', 'Carol']),
+    ('experience', 'asc', ['bob', 'Alice', 'Eve', 'Dave', 'Carol']),
+    ('name', 'asc', ['Alice', 'bob', 'Carol', 'Dave', 'Eve']),
+    ('name', 'desc', ['Eve', 'Dave', 'Carol', 'bob', 'Alice'])
+])
+def test_sorting_puts_missing_values_last(search, sort, order, expected):
+    assert _names(search(f'sort={sort}&order={order}')) == expected
+    # Filtered searches rank through the same precomputed order
+    assert _names(search(f'sort={sort}&order={order}&consultation_type=video,in-person')) == expected
+
+def test_paging(search):
+    first = search('sort=name&limit=2&offset=1')
+    assert _names(first) == ['bob', 'Carol']
+    assert first.headers['X-Total-Count'] == '5'
+    link = first.headers['Link']
+    assert 'offset=3' in link and 'limit=2' in link and link.endswith('rel="next"')
+
+    last = search('sort=name&limit=2&offset=4')
+    assert _names(last) == ['Eve'] and 'Link' not in last.headers
+    beyond = search('sort=name&limit=2&offset=10')
+    assert _names(beyond) == [] and beyond.headers['X-Total-Count'] == '5'
+
+@pytest.mark.parametrize('query', ['sort=popularity', 'order=up', 'min_fee=cheap', 'max_fee=-1',
+                                   'limit=0', 'limit=5000', 'offset=-1', 'offset=one'])
+def test_bad_parameters(search, query):
+    response = search(query)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,34 @@
+"""The bucketed metrics endpoint refuses to serialize an unbounded number of buckets"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from metric_aggregation import AggregationError, aggregate_metrics
+
+def _seed_minutes(n_readings, patient_id=1):
+    from models import db, HealthMetric, Patient
+
+    db.session.add(Patient(id=patient_id, name='Buckets', email='buckets@example.com', password_hash='-'))
+    start = datetime(2024, 1, 1)
+    db.session.add_all(HealthMetric(patient_id=patient_id, metric_type='heart_rate', value=60 + i, unit='bpm',
+                                    date=start + timedelta(minutes=i)) for i in range(n_readings))
+    db.session.commit()
+
+def test_open_range_is_capped(medical_app):
+    from models import db, HealthMetric
+
+    _seed_minutes(30)
+    assert len(aggregate_metrics(db.session, HealthMetric, 1, 'heart_rate', '1m', max_buckets=30)) == 30
+    with pytest.raises(AggregationError):
+        aggregate_metrics(db.session, HealthMetric, 1, 'heart_rate', '1m', max_buckets=29)
+    assert len(aggregate_metrics(db.session, HealthMetric, 1, 'heart_rate', '1h', max_buckets=1)) == 1
+
+def test_oversized_range_is_a_bad_request(medical_app, auth_headers):
+    _seed_minutes(3)
+    client = medical_app.test_client()
+    url = '/api/medical/metrics?type=heart_rate&bucket=1m'
+    response = client.get(f'{url}&since=2024-01-01&until=2025-01-01', headers=auth_headers(1))
+    assert response.status_code == 400
+    response = client.get(f'{url}&since=2024-01-01&until=2024-01-02', headers=auth_headers(1))
+    assert response.status_code == 200 and len(response.get_json()) == 3
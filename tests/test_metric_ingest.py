@@ -0,0 +1,28 @@
+"""Bulk metric validation turns malformed readings into per-row errors, never an exception"""
+
+from datetime import datetime
+
+from metric_ingest import validate_metric_rows
+
+def test_malformed_readings_are_rejected_per_row():
+    items = [
+        {'metric_type': 5, 'value': 1},                         # no string in the metric_type column at index 0
+        {'metric_type': 'heart_rate', 'value': 10 ** 400},      # integer beyond the float range
+        {'metric_type': 'heart_rate', 'value': 72, 'unit': 7},  # numeric unit
+        {'metric_type': 'heart_rate', 'value': True},
+        {'metric_type': 'heart_rate', 'value': 72, 'unit': 'bpm', 'date': '2024-01-01T08:00:00Z'},
+        'not an object'
+    ]
+    rows, errors = validate_metric_rows(items, patient_id=1)
+
+    assert [error['index'] for error in errors] == [0, 1, 2, 3, 5]
+    assert 'metric_type' in errors[0]['error']
+    assert errors[1]['error'] == 'value must be a finite number'
+    assert 'unit' in errors[2]['error']
+    assert rows == [{'patient_id': 1, 'metric_type': 'heart_rate', 'value': 72.0, 'unit': 'bpm',
+                     'date': datetime(2024, 1, 1, 8)}]
+
+def test_columns_without_any_string():
+    rows, errors = validate_metric_rows([{'metric_type': 5, 'value': 1, 'unit': 3}], patient_id=1)
+    assert rows == []
+    assert errors[0]['index'] == 0 and 'metric_type' in errors[0]['error'] and 'unit' in errors[0]['error']
@@ -0,0 +1,87 @@
+"""Walking the keyset pages of each listing returns every row exactly once, newest first"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+# path -> (model name, sort attribute)
+LISTINGS = {
+    '/api/medical/records': ('MedicalRecord', 'date'),
+    '/api/medical/appointments': ('Appointment', 'date'),
+    '/api/medical/prescriptions': ('Prescription', 'start_date'),
+    '/api/medical/metrics': ('HealthMetric', 'date')
+}
+N_ROWS = 25
+
+def _seed():
+    from models import db, Appointment, Doctor, HealthMetric, MedicalRecord, Patient, Prescription
+
+    doctor = Doctor(name='Dr. Pages', email='pages@example.com', specialty='Cardiology')
+    db.session.add(doctor)
+    for patient_id in (1, 2):
+        db.session.add(Patient(id=patient_id, name='Pages', email=f'pages{patient_id}@example.com',
+                               password_hash='-'))
+    db.session.flush()
+    for patient_id in (1, 2):
+        for i in range(N_ROWS):
+            # Three rows per day, so pages split inside runs of equal sort values
+            day = date(2024, 1, 1) + timedelta(days=i // 3)
+            moment = datetime.combine(day, datetime.min.time())
+            db.session.add(MedicalRecord(patient_id=patient_id, date=moment, doctor=doctor.name, diagnosis='Checkup'))
+            db.session.add(Appointment(patient_id=patient_id, doctor_id=doctor.id, date=day, time='09:00'))
+            db.session.add(Prescription(patient_id=patient_id, name='Aspirin', dosage='81mg', doctor=doctor.name,
+                                        start_date=day))
+            db.session.add(HealthMetric(patient_id=patient_id, metric_type='heart_rate', value=70, unit='bpm',
+                                        date=moment))
+    db.session.commit()
+
+def _expected_ids(model_name, sort_key, since=None, until=None):
+    import models
+
+    model = getattr(models, model_name)
+    column = getattr(model, sort_key)
+    query = model.query.filter_by(patient_id=1)
+    if since is not None:
+        query = query.filter(column >= since)
+    if until is not None:
+        query = query.filter(column < until)
+    return [row.id for row in query.order_by(column.desc(), model.id.desc())]
+
+def _walk(client, url, headers):
+    ids, pages = [], 0
+    while url:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        ids.extend(item['id'] for item in response.get_json())
+        pages += 1
+        link = response.headers.get('Link')
+        assert (link is None) == (response.headers.get('X-Next-Cursor') is None)
+        url = link[1:link.index('>')] if link else None
+    return ids, pages
+
+@pytest.mark.parametrize('path', LISTINGS)
+def test_every_row_once(medical_app, auth_headers, path):
+    _seed()
+    model_name, sort_key = LISTINGS[path]
+    ids, pages = _walk(medical_app.test_client(), f'{path}?limit=4', auth_headers(1))
+    assert ids == _expected_ids(model_name, sort_key)
+    assert len(ids) == N_ROWS and pages == 7
+
+@pytest.mark.parametrize('path', LISTINGS)
+def test_range_with_cursor(medical_app, auth_headers, path):
+    _seed()
+    model_name, sort_key = LISTINGS[path]
+    ids, _ = _walk(medical_app.test_client(), f'{path}?limit=2&since=2024-01-02&until=2024-01-06', auth_headers(1))
+    since, until = datetime(2024, 1, 2), datetime(2024, 1, 6)
+    if sort_key == 'start_date' or model_name == 'Appointment':
+        since, until = since.date(), until.date()
+    expected = _expected_ids(model_name, sort_key, since, until)
+    assert ids == expected and len(expected) == 12
+
+@pytest.mark.parametrize('query', ['cursor=not-a-cursor', 'cursor=WzEsMl0', 'limit=0', 'limit=abc',
+                                   'since=yesterday'])
+def test_bad_parameters(medical_app, auth_headers, query):
+    _seed()
+    response = medical_app.test_client().get(f'/api/medical/records?{query}', headers=auth_headers(1))
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
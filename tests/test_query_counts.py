@@ -0,0 +1,51 @@
+"""The patient history listings issue a constant number of SQL statements (no N+1 lazy loads)"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from query_counter import count_queries
+
+LISTINGS = ['/api/medical/records', '/api/medical/appointments',
+            '/api/medical/prescriptions', '/api/medical/metrics']
+SIZES = (1, 10, 100)
+
+def _seed(n_rows, patient_id):
+    from models import db, Appointment, Doctor, HealthMetric, MedicalRecord, Patient, Prescription
+
+    db.session.add(Patient(id=patient_id, name='Query Count', email=f'patient{patient_id}@example.com',
+                           password_hash='-'))
+    start = datetime(2024, 1, 1)
+    for i in range(n_rows):
+        # A distinct doctor per appointment, so lazy loads cannot hide in the identity map
+        doctor = Doctor(name=f'Doctor {patient_id}-{i}', email=f'doctor{patient_id}-{i}@example.com',
+                        specialty='Cardiology')
+        db.session.add(doctor)
+        db.session.flush()
+        db.session.add(Appointment(patient_id=patient_id, doctor_id=doctor.id,
+                                   date=date(2024, 1, 1) + timedelta(days=i), time='09:00'))
+        db.session.add(MedicalRecord(patient_id=patient_id, date=start + timedelta(days=i),
+                                     doctor=doctor.name, diagnosis='Checkup'))
+        db.session.add(Prescription(patient_id=patient_id, name='Aspirin', dosage='81mg', doctor=doctor.name,
+                                    start_date=date(2024, 1, 1) + timedelta(days=i)))
+        db.session.add(HealthMetric(patient_id=patient_id, metric_type='heart_rate', value=70 + i % 10,
+                                    unit='bpm', date=start + timedelta(hours=i)))
+    db.session.commit()
+
+@pytest.mark.parametrize('path', LISTINGS)
+def test_listing_statement_count_is_constant(medical_app, auth_headers, path):
+    from models import db
+
+    for patient_id, n_rows in enumerate(SIZES, start=1):
+        _seed(n_rows, patient_id)
+    client = medical_app.test_client()
+
+    counts = []
+    for patient_id, n_rows in enumerate(SIZES, start=1):
+        db.session.remove()
+        with count_queries(db.engine) as statements:
+            response = client.get(f'{path}?limit={max(SIZES)}', headers=auth_headers(patient_id))
+        assert response.status_code == 200
+        assert len(response.get_json()) == n_rows
+        counts.append(len(statements))
+    assert len(set(counts)) == 1, f'{path} issues {counts} statements for {list(SIZES)} rows'
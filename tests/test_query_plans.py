@@ -0,0 +1,53 @@
+"""The statements the hot routes issue are answered through indexes (SQLite EXPLAIN QUERY PLAN)"""
+
+from datetime import date, datetime
+
+from migrations import HOT_ROUTES, check_query_plans, upgrade
+
+def _seed(patient_id=1):
+    from models import db, Appointment, Doctor, HealthMetric, MedicalRecord, Patient, Prescription
+
+    db.session.add(Patient(id=patient_id, name='Plans', email='plans@example.com', password_hash='-'))
+    doctor = Doctor(name='Dr. Plans', email='dr.plans@example.com', specialty='Cardiology')
+    db.session.add(doctor)
+    db.session.flush()
+    db.session.add(Appointment(patient_id=patient_id, doctor_id=doctor.id, date=date(2024, 1, 2), time='09:00'))
+    db.session.add(MedicalRecord(patient_id=patient_id, date=datetime(2024, 1, 2), doctor=doctor.name,
+                                 diagnosis='Checkup'))
+    db.session.add(Prescription(patient_id=patient_id, name='Aspirin', dosage='81mg', doctor=doctor.name,
+                                start_date=date(2024, 1, 2)))
+    db.session.add(HealthMetric(patient_id=patient_id, metric_type='heart_rate', value=72, unit='bpm',
+                                date=datetime(2024, 1, 2)))
+    db.session.commit()
+
+def test_hot_routes_use_indexes(medical_app):
+    from models import db
+
+    upgrade(db.engine)
+    _seed()
+    results = check_query_plans(medical_app)
+    assert set(results) == {name for name, _, _, _ in HOT_ROUTES}
+    failed = {name: plan for name, (ok, plan) in results.items() if not ok}
+    assert not failed
+
+def test_missing_index_is_reported(medical_app):
+    from models import db
+
+    upgrade(db.engine)
+    _seed()
+    db.session.execute(db.text('DROP INDEX ix_medical_record_patient_date'))
+    db.session.commit()
+    results = check_query_plans(medical_app)
+    assert not results['medical records'][0]
+    assert results['prescriptions'][0]
+
+def test_unsupported_database_is_reported_as_skipped(tmp_path, monkeypatch, capsys):
+    import migrations
+    from models import db
+
+    database_url = f"sqlite:///{tmp_path / 'skipped.db'}"
+    db.metadata.create_all(migrations.create_engine(database_url))
+    monkeypatch.setattr(migrations, 'PLAN_CHECK_DIALECTS', ('postgresql',))
+    assert migrations.main([database_url, '--check']) == migrations.PLAN_CHECK_SKIPPED
+    assert 'Query plan check skipped' in capsys.readouterr().out
+    assert migrations.current_version(migrations.create_engine(database_url)) == migrations.MIGRATIONS[-1][0]